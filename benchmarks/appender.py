@@ -0,0 +1,69 @@
+"""
+Compares saving one changed value of a large state: `WTFLAppender.set` and a flush
+against rewriting the whole file with `wtfl.dump`. The appended file is checked
+to load into the same value as the rewritten one.
+
+    python benchmarks/appender.py [keys] [updates]
+"""
+from __future__ import annotations
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wtfl
+from wtfl.reader import PythonValue
+
+
+def main(keys: int = 20000, updates: int = 200) -> None:
+    rng = random.Random(0)
+    state: Dict[str, PythonValue] = {
+        f"service{i}": {"host": f"host{i}", "port": 8000 + i, "enabled": True} for i in range(keys)
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        rewritten = os.path.join(directory, "rewritten.wtfl")
+        appended = os.path.join(directory, "appended.wtfl")
+
+        for path in (rewritten, appended):
+            with open(path, "w", encoding="utf-8") as file:
+                wtfl.dump(file, state, compact=True)
+
+        rewrite_time = 0.0
+        append_time = 0.0
+
+        with wtfl.WTFLAppender(appended) as appender:
+            for _ in range(updates):
+                service = f"service{rng.randrange(keys)}"
+                port = rng.randrange(1024, 65536)
+                service_state = state[service]
+                assert isinstance(service_state, dict)
+                service_state["port"] = port
+
+                started = time.perf_counter()
+                with open(rewritten, "w", encoding="utf-8") as file:
+                    wtfl.dump(file, state, compact=True)
+                rewrite_time += time.perf_counter() - started
+
+                started = time.perf_counter()
+                appender.set((service, "port"), port)
+                appender.flush()
+                append_time += time.perf_counter() - started
+
+        with open(appended, encoding="utf-8") as file:
+            assert wtfl.load(file) == state
+
+        print(f"{keys} keys, {updates} updates")
+        print(f"  rewrite: {rewrite_time / updates * 1e3:9.3f} ms per update, {os.path.getsize(rewritten)} bytes")
+        print(
+            f"   append: {append_time / updates * 1e3:9.3f} ms per update, {os.path.getsize(appended)} bytes"
+            f"  {rewrite_time / append_time:6.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,47 @@
+"""
+Times loading of big arrays: the whole `wtfl.loads` call
+and filling a `Store` with the same items followed by `to_python_value`.
+
+    python benchmarks/arrays.py [items]
+"""
+from __future__ import annotations
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wtfl
+from wtfl.internal_types import ARRAY_KEY
+from wtfl.reader import Store
+
+
+def document(items: int) -> str:
+    # an array starting with 0 would read as `has 0`
+    body = "\n".join(f"  {i}" for i in range(1, items + 1))
+    return f"numbers is has\n{body}\nthat\n"
+
+
+def fill(items: int) -> None:
+    store = Store()
+    store[ARRAY_KEY] = True
+    for i in range(items):
+        store[str(i)] = i
+    store.to_python_value()
+
+
+def main(items: int = 100000) -> None:
+    text = document(items)
+    result = wtfl.loads(text)
+    assert result == {"numbers": list(range(1, items + 1))}
+
+    store = min(timeit.repeat(lambda: fill(items), number=1, repeat=5))
+    loads = min(timeit.repeat(lambda: wtfl.loads(text), number=1, repeat=3))
+
+    print(f"{items} items")
+    print(f"store: {store:.4f} s")
+    print(f"loads: {loads:.4f} s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
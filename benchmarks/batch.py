@@ -0,0 +1,56 @@
+"""
+Loads many small documents one `wtfl.loads` call at a time and with `wtfl.loads_many`
+in a thread and a process pool. Results are checked to be equal, and errors of
+invalid documents to come back from both pools.
+
+    python benchmarks/batch.py [documents] [statements] [workers]
+"""
+from __future__ import annotations
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+import wtfl
+
+
+def main(documents: int = 2000, statements: int = 20, workers: int = 0) -> None:
+    logging.disable(logging.WARNING)
+    workers = workers or os.cpu_count() or 1
+
+    batch = [generate(seed, statements) for seed in range(documents)]
+
+    start = time.perf_counter()
+    expected = [wtfl.loads(document) for document in batch]
+    serial = time.perf_counter() - start
+
+    print(f"{documents} documents of {statements} statements, {workers} workers")
+    print(f"{'serial':>9}: {serial:6.2f} s")
+
+    for name, executor in (
+        ("threads", ThreadPoolExecutor(workers)),
+        ("processes", ProcessPoolExecutor(workers)),
+    ):
+        with executor:
+            # starts the workers and builds their parsers
+            wtfl.loads_many(["warm is 1"] * workers, executor=executor, workers=workers)
+
+            start = time.perf_counter()
+            results = wtfl.loads_many(batch, executor=executor, workers=workers)
+            elapsed = time.perf_counter() - start
+
+        assert [result.unwrap() for result in results] == expected
+        print(f"{name:>9}: {elapsed:6.2f} s  {serial / elapsed:5.2f}x")
+
+    for pool in ("thread", "process"):
+        invalid = wtfl.loads_many(["a_ is 1", "x is", "b_ is 2"], workers=workers, pool=pool)
+        assert [result.ok for result in invalid] == [True, False, True]
+        assert isinstance(invalid[1].error, ValueError), invalid[1]
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:4]))
@@ -0,0 +1,53 @@
+"""
+Compares validating corpus documents with `wtfl.check` against loading them with `wtfl.loads`,
+and checks that `check` finds errors exactly in the documents `loads` rejects.
+
+    python benchmarks/check.py [statements] [repeats]
+"""
+from __future__ import annotations
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+import wtfl
+
+
+def loads_ok(s: str) -> bool:
+    try:
+        wtfl.loads(s)
+    except ValueError:
+        return False
+    return True
+
+
+def main(statements: int = 5000, repeats: int = 5) -> None:
+    logging.disable(logging.WARNING)
+    wtfl.loads("warm is 1")
+
+    for shape in ("time_travel", "constraints", "mixed"):
+        s = generate(0, statements, shape)
+        errors = [d for d in wtfl.check(s) if d.severity == "error"]
+        assert loads_ok(s) == (not errors), errors
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            loads_ok(s)
+        loads_time = (time.perf_counter() - started) / repeats
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            wtfl.check(s)
+        check_time = (time.perf_counter() - started) / repeats
+
+        print(
+            f"{shape:>12}: loads {loads_time * 1e3:8.1f} ms, check {check_time * 1e3:8.1f} ms"
+            f"  {loads_time / check_time:5.2f}x, {len(errors)} errors"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
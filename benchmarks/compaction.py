@@ -0,0 +1,57 @@
+"""
+Compacts documents that grew by repeated assignments (an append log written by
+`WTFLAppender`) and corpus shapes, and prints the size and load time before and after.
+
+    python benchmarks/compaction.py [keys] [updates per key]
+"""
+from __future__ import annotations
+import logging
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+import wtfl
+
+
+def append_log(path: str, keys: int, updates: int) -> None:
+    rng = random.Random(0)
+
+    with wtfl.WTFLAppender(path) as appender:
+        for _ in range(keys * updates):
+            key = rng.randrange(keys)
+            appender.set((f"service{key}", "port"), rng.randrange(1024, 65536))
+            appender.set((f"service{key}", "tags"), [f"tag{i}" for i in range(rng.randrange(4))])
+
+
+def main(keys: int = 1000, updates: int = 10) -> None:
+    logging.disable(logging.WARNING)
+    wtfl.loads("warm is 1")
+
+    with tempfile.TemporaryDirectory() as directory:
+        documents = {"append log": os.path.join(directory, "log.wtfl")}
+        append_log(documents["append log"], keys, updates)
+
+        for shape in ("time_travel", "constraints", "mixed"):
+            documents[shape] = os.path.join(directory, f"{shape}.wtfl")
+
+            with open(documents[shape], "w", encoding="utf-8") as file:
+                file.write(generate(0, keys * 2, shape))
+
+        print(f"{'':>12} {'bytes':>17} {'statements':>15} {'load ms':>17} {'size':>5} {'time':>5}")
+
+        for name, path in documents.items():
+            report = wtfl.compact(path, path + ".compact")
+            print(
+                f"{name:>12} {report.source_size:8} {report.compacted_size:8}"
+                f" {report.source_statements:7} {report.compacted_statements:7}"
+                f" {report.source_time * 1e3:8.1f} {report.compacted_time * 1e3:8.1f}"
+                f" {report.size_reduction:5.0%} {report.load_time_reduction:5.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
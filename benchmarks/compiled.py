@@ -0,0 +1,88 @@
+"""
+Compares `wtfl.load` with `wtfl.load_compiled` (up-to-date .wtflc file) on the same files,
+in the same process and in a fresh interpreter (import + load, warm grammar cache).
+Results are checked to be equal.
+
+    python benchmarks/compiled.py [statements] [runs]
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import SHAPES, generate
+import wtfl
+
+PROBE = """
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+import wtfl
+if sys.argv[2] == "compiled":
+    wtfl.load_compiled(sys.argv[1], write=False)
+else:
+    with open(sys.argv[1]) as file:
+        wtfl.load(file)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def fresh_process(path: str, mode: str) -> float:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, path, mode],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def load_source(path: str) -> object:
+    with open(path) as file:
+        return wtfl.load(file)
+
+
+def main(statements: int = 2000, runs: int = 5) -> None:
+    logging.disable(logging.WARNING)
+
+    print(f"{statements} statements, ms (in-process: best of {runs}, fresh process: median of {runs})")
+    print(f"{'shape':<12} {'load':>9} {'compiled':>9} {'speedup':>8} {'proc load':>10} {'proc compiled':>14}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for shape in SHAPES:
+            path = os.path.join(directory, f"{shape}.wtfl")
+
+            with open(path, "w") as file:
+                file.write(generate(0, statements, shape))
+
+            wtfl.compile_file(path)
+            assert wtfl.load_compiled(path, write=False) == load_source(path), shape
+
+            source = min(timeit.repeat(lambda: load_source(path), number=1, repeat=runs))
+            compiled = min(
+                timeit.repeat(lambda: wtfl.load_compiled(path, write=False), number=1, repeat=runs)
+            )
+
+            process_source = statistics.median(fresh_process(path, "source") for _ in range(runs))
+            process_compiled = statistics.median(
+                fresh_process(path, "compiled") for _ in range(runs)
+            )
+
+            print(
+                f"{shape:<12} {source * 1e3:9.2f} {compiled * 1e3:9.2f} {source / compiled:7.0f}x"
+                f" {process_source * 1e3:10.1f} {process_compiled * 1e3:14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
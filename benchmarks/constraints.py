@@ -0,0 +1,122 @@
+"""
+Times applying operations of a document with many constraints
+(`has to be`, `can't be`, `cannot be`, one path with all the `can't be` values)
+and even more unconstrained assignments,
+compared with the previous engine that kept constraints in a dict of tuples
+and branched on the constraint type on every check.
+
+    python benchmarks/constraints.py [constraints]
+"""
+from __future__ import annotations
+import os
+import sys
+import timeit
+from typing import Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wtfl.internal_types import Assign, Constraint, Operation
+from wtfl.parser import parse
+from wtfl.reader import Reader, ReadState
+
+
+def document(constraints: int) -> str:
+    lines = []
+
+    for i in range(constraints):
+        rule = i % 3
+        if rule == 0:
+            lines.append(f"limit of rule{i} of rules has to be {i}")
+        elif rule == 1:
+            lines.append(f"limit of rule{i} of rules can't be {i}")
+        else:
+            lines.append(f"forbidden of rule{i} of rules cannot be")
+
+    for i in range(constraints):
+        lines.append(f"mode of server can't be {i}")
+    for i in range(constraints):
+        lines.append(f"mode of server is {-i - 1}")
+
+    for i in range(constraints):
+        base = i - i % 3
+        lines.append(f"limit of rule{base} of rules is {base}")
+        lines.append(f"limit of rule{base + 1} of rules is {base + 2}")
+        # unconstrained
+        for j in range(5):
+            lines.append(f"value{j} of item{i} of items is {j}")
+            lines.append(f"other{j} of rule{i} of rules is {j}")
+
+    return "\n".join(lines) + "\n"
+
+
+class LegacyState(ReadState):
+    """the previous engine"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.legacy: Dict[Tuple[str, ...], List[Constraint]] = {}
+
+    def add_constraint(self, constraint: Constraint) -> None:
+        store = self.resolve_path(list(constraint.key))
+
+        if store:
+            for value in store.values():
+                try:
+                    constraint.check(value)
+                except ValueError:
+                    break
+
+        self.legacy.setdefault(constraint.key, []).append(constraint)
+
+    def assign(self, op: Assign) -> None:
+        self.check_constraint(op)
+        self.assign_path(op.key, op.value)
+
+    def check_constraint(self, op: Assign) -> None:
+        constraints = self.legacy.get(tuple(op.key))
+
+        if not constraints:
+            return
+
+        for constraint in constraints:
+            value = op.value
+
+            if constraint.ctype == "hastobe":
+                if value != constraint.value:
+                    raise ValueError(constraint.key_repr())
+                continue
+
+            if constraint.ctype == "cantbe":
+                if value == constraint.value:
+                    raise ValueError(constraint.key_repr())
+
+            if constraint.ctype == "cant_exist":
+                raise ValueError(constraint.key_repr())
+
+
+def apply(operations: Sequence[Operation], state: ReadState) -> ReadState:
+    reader = Reader()
+    for operation in operations:
+        reader.apply_operation(operation, state)
+    return state
+
+
+def main(constraints: int = 2000) -> None:
+    reader = Reader()
+    operations = [
+        op
+        for statement in parse(document(constraints), (None,) * 4)
+        for op in reader.process_operation(statement)
+    ]
+
+    assert apply(operations, ReadState()).to_dict() == apply(operations, LegacyState()).to_dict()
+
+    rules = sum(isinstance(op, Constraint) for op in operations)
+    print(f"{rules} constraints, {len(operations) - rules} assignments")
+
+    for name, state in (("indexed", ReadState), ("legacy", LegacyState)):
+        best = min(timeit.repeat(lambda: apply(operations, state()), number=1, repeat=5))
+        print(f"{name:>8}: {best:.4f} s")
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,277 @@
+"""
+Seeded generator of synthetic WTFL documents.
+Every generated document is valid and loads without errors.
+
+    python benchmarks/corpus.py [seed] [statements] [shape]
+"""
+from __future__ import annotations
+import random
+import sys
+from typing import Callable, Dict, List
+
+
+# leaves and containers never swap roles, so no value gets replaced by an object
+LEAVES = ["weight", "color", "port", "host", "timeout", "retries", "user_name", "max-size"]
+CONTAINERS = ["apple", "crate", "server", "_private", "Value2"]
+PREFIXES = ["a", "an", "the", "de", "du", "le", "la", "des", "les", "um", "but"]
+IS = ["is", "are", "'s", "'re", "do", "does", "be", "IS", "Are"]
+COMMENTS = ["... a comment", "...another one, with punctuation!", "..."]
+
+
+def name(rng: random.Random, names: List[str], prefix: str) -> str:
+    if rng.random() < 0.3:
+        return f"{prefix}{rng.randrange(1000)}"
+    return rng.choice(names)
+
+
+def key(rng: random.Random, depth: int = 3) -> str:
+    parts = [name(rng, LEAVES, "k")]
+    parts.extend(name(rng, CONTAINERS, "c") for _ in range(rng.randint(0, depth - 1)))
+
+    return " of ".join(
+        f"{rng.choice(PREFIXES)} {part}" if rng.random() < 0.2 else part
+        for part in parts
+    )
+
+
+def number(rng: random.Random, negative: bool = True) -> str:
+    n = rng.randrange(1, 5000)
+    forms: List[Callable[[], str]] = [
+        lambda: str(n),
+        lambda: f"{n // 100}_{n % 100:02}",
+        lambda: f"-{n}" if negative else str(n),
+        lambda: f"{n}.{rng.randrange(100)}",
+        lambda: f".{rng.randrange(1, 10)}",
+        lambda: f"{n}.",
+        lambda: f"{n}.5e{rng.randrange(-5, 5)}",
+        lambda: f"0b{n:b}",
+        lambda: f"0o{n:o}",
+        lambda: f"0z{rng.randrange(1, 10)}a{rng.randrange(10)}",
+        lambda: f"0v{rng.randrange(1, 10)}j",
+        lambda: f"0u{'1' * rng.randrange(1, 8)}",
+        lambda: f"0r{rng.choice(['XIV', 'mcm', 'IX', 'LXXX', 'd'])}",
+    ]
+    return rng.choice(forms)()
+
+
+def value(rng: random.Random, negative: bool = True) -> str:
+    roll = rng.random()
+    if roll < 0.5:
+        return number(rng, negative)
+    if roll < 0.8:
+        return rng.choice(['"text"', '"with \\"escape\\""', '"line\\nbreak"', '""'])
+    if roll < 0.9:
+        return rng.choice(["true", "false", "truen't", "falsen't", "TRUE"])
+    return rng.choice(["haven't", "hasn't", "'ven't"])
+
+
+def block(rng: random.Random, indent: str, depth: int) -> str:
+    """object or array literal, starting right after `is`"""
+    inner = indent + "  "
+    have = rng.choice(["have", "has", "'ve", "HAS"])
+    tail = rng.choice(["that", "that's all", "these are the keys", "there it is!", "THIS"])
+
+    if depth == 0 or rng.random() < 0.3:
+        if rng.random() < 0.2:
+            return f"{have} 0"
+        lines = [element(rng, inner, depth - 1) for _ in range(rng.randint(1, 4))]
+    else:
+        lines = [pair(rng, inner, depth - 1, i) for i in range(rng.randint(1, 4))]
+
+    body = "".join(f"\n{inner}{line}" for line in lines)
+    return f"{have}{body}\n{indent}{tail}"
+
+
+def pair(rng: random.Random, indent: str, depth: int, index: int) -> str:
+    if depth > 0 and rng.random() < 0.3:
+        container = f"{rng.choice(CONTAINERS)}_{index}"
+        return f"{container} {rng.choice(IS)} {block(rng, indent, depth)}"
+    return f"{name(rng, LEAVES, 'k')} {rng.choice(IS)} {value(rng)}"
+
+
+def element(rng: random.Random, indent: str, depth: int) -> str:
+    if depth > 0 and rng.random() < 0.3:
+        return block(rng, indent, depth)
+    return value(rng, negative=False)  # negative array items do not parse
+
+
+def statement(rng: random.Random, index: int) -> str:
+    roll = rng.random()
+
+    if roll < 0.45:
+        return f"{key(rng)} {rng.choice(IS)} {value(rng)}"
+
+    if roll < 0.6:
+        return f"block{index} is {block(rng, '', 3)}"
+
+    if roll < 0.7:
+        travel = rng.choice(["return 1", "skip 1", "stay", "RETURN 0b1", "skip 0rI", "Skip 0u11"])
+        return f"{travel} and {key(rng)} is {value(rng)}"
+
+    if roll < 0.8:
+        limit = f"limit{index}"
+        checked = rng.randrange(100)
+        return rng.choice(
+            [
+                f"{limit} has to be {checked}\n{limit} is {checked}",
+                f"{limit} can't be {checked}\n{limit} is {checked + 1}",
+                f"{limit} can be {checked}",
+                f"{limit} can be",
+                f"{limit} cannot be",
+            ]
+        )
+
+    if roll < 0.9:
+        return f"{rng.choice(COMMENTS)}\n{key(rng)} is {value(rng)}"
+
+    return f"{key(rng)} is {value(rng)} {rng.choice(['also', 'and also', 'but also'])} {key(rng)} is {value(rng)}"
+
+
+def mixed(rng: random.Random, statements: int) -> str:
+    return "\n".join(statement(rng, i) for i in range(statements))
+
+
+def wide(rng: random.Random, statements: int) -> str:
+    """a flat object with many keys"""
+    return "\n".join(
+        f"{rng.choice(PREFIXES) + ' ' if rng.random() < 0.1 else ''}key{i} {rng.choice(IS)} {value(rng)}"
+        for i in range(statements)
+    )
+
+
+def deep(rng: random.Random, statements: int) -> str:
+    """long `of` chains, all going through the same containers"""
+    lines = []
+
+    for i in range(statements):
+        depth = rng.randint(5, 30)
+        chain = " of ".join(f"level{level}" for level in reversed(range(depth)))
+        lines.append(f"leaf{i} of {chain} is {value(rng)}")
+
+    return "\n".join(lines)
+
+
+def arrays(rng: random.Random, statements: int) -> str:
+    """a few big arrays of scalars"""
+    lines = []
+    left = statements
+
+    for i in range(max(1, statements // 500)):
+        size = min(left, rng.randint(250, 750)) if i < statements // 500 - 1 else left
+        left -= size
+        items = "".join(f"\n  {value(rng, negative=False)}" for _ in range(max(size, 1)))
+        # an array starting with 0 would read as `has 0`
+        lines.append(f"array{i} is has\n  1{items}\nthat")
+
+    return "\n".join(lines)
+
+
+def inline(rng: random.Random, statements: int) -> str:
+    """several statements, objects and arrays per line, joined with `also`"""
+    lines = []
+    i = 0
+
+    while i < statements:
+        parts = []
+        for _ in range(rng.randint(2, 6)):
+            roll = rng.random()
+            if roll < 0.6:
+                parts.append(f"{key(rng)} {rng.choice(IS)} {value(rng)}")
+            elif roll < 0.8:
+                pairs = " ".join(f"{name(rng, LEAVES, 'k')} is {value(rng)}" for _ in range(3))
+                parts.append(f"inline{i} is has {pairs} that's all")
+            else:
+                items = " ".join(value(rng, negative=False) for _ in range(3))
+                parts.append(f"list{i} is has 1 {items} that")
+            i += 1
+        lines.append(" ".join(f"{part} {rng.choice(['also', 'and also', 'but also'])}" for part in parts[:-1]) + f" {parts[-1]}")
+
+    return "\n".join(lines)
+
+
+def time_travel(rng: random.Random, statements: int) -> str:
+    """every statement travels, some of them several times"""
+    lines = []
+
+    for _ in range(statements):
+        chain = []
+        for _ in range(rng.randint(1, 3)):
+            kind = rng.choice(["return", "skip", "stay"])
+            chain.append("stay" if kind == "stay" else f"{kind} {rng.randrange(1, 20)}")
+        lines.append(f"{' and '.join(chain)} and key{rng.randrange(50)} is {value(rng)}")
+
+    return "\n".join(lines)
+
+
+def constraints(rng: random.Random, statements: int) -> str:
+    """rules first, then assignments that satisfy them"""
+    rules = []
+    assigns = []
+
+    for i in range(max(1, statements // 2)):
+        checked = rng.randrange(1000)
+        kind = rng.randrange(4)
+        target = f"limit of rule{i} of rules"
+
+        if kind == 0:
+            rules.append(f"{target} has to be {checked}")
+            assigns.append(f"{target} is {checked}")
+        elif kind == 1:
+            rules.append(f"{target} can't be {checked}")
+            assigns.append(f"{target} is {checked + 1}")
+        elif kind == 2:
+            rules.append(f"{target} cannot be")
+            assigns.append(f"other of rule{i} of rules is {checked}")
+        else:
+            rules.append(f"{target} can be {checked}")
+            assigns.append(f"{target} is {checked}")
+
+    return "\n".join(rules + assigns)
+
+
+NUMBER_FORMS: List[Callable[[random.Random], str]] = [
+    lambda rng: str(rng.randrange(100000)),
+    lambda rng: f"-{rng.randrange(1, 100000)}",
+    lambda rng: f"{rng.randrange(1, 1000)}_{rng.randrange(1000):03}",
+    lambda rng: f"{rng.randrange(1000)}.{rng.randrange(1000)}",
+    lambda rng: f"{rng.randrange(1000)}.",
+    lambda rng: f".{rng.randrange(10)}",
+    lambda rng: f"{rng.randrange(100)}.{rng.randrange(10)}e{rng.choice(['', '-', '+'])}{rng.randrange(10)}",
+    lambda rng: f"{rng.randrange(1, 100)}{rng.choice('eE')}{rng.randrange(10)}",
+    lambda rng: f"0{rng.choice('bB')}{rng.randrange(1, 4096):b}",
+    lambda rng: f"0{rng.choice('oO')}{rng.randrange(1, 4096):o}",
+    lambda rng: f"0{rng.choice('dD')}{rng.randrange(100000)}",
+    lambda rng: f"0{rng.choice('xX')}{rng.randrange(1, 1 << 20):{rng.choice('xX')}}",
+    lambda rng: f"0z{rng.randrange(1, 10)}{rng.choice('0123456789ab')}{rng.choice('AB9')}",
+    lambda rng: f"0v{rng.randrange(1, 10)}{rng.choice('abcdefghij')}{rng.choice('GHIJ0')}",
+    lambda rng: f"0u{'1' * rng.randrange(1, 20)}",
+    lambda rng: f"0r{rng.choice(['XIV', 'mcm', 'IX', 'LXXX', 'd', 'MMXXIII'])}",
+]
+
+
+def numbers(rng: random.Random, statements: int) -> str:
+    """every number literal form"""
+    return "\n".join(
+        f"number{i} is {NUMBER_FORMS[i % len(NUMBER_FORMS)](rng)}" for i in range(statements)
+    )
+
+
+SHAPES: Dict[str, Callable[[random.Random, int], str]] = {
+    "mixed": mixed,
+    "wide": wide,
+    "deep": deep,
+    "arrays": arrays,
+    "inline": inline,
+    "time_travel": time_travel,
+    "constraints": constraints,
+    "numbers": numbers,
+}
+
+
+def generate(seed: int = 0, statements: int = 1000, shape: str = "mixed") -> str:
+    rng = random.Random(seed)
+    return SHAPES[shape](rng, statements) + "\n"
+
+
+if __name__ == "__main__":
+    print(generate(*map(int, sys.argv[1:3]), *sys.argv[3:4]))
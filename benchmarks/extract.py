@@ -0,0 +1,54 @@
+"""
+Compares building the whole state and converting it (`loads` without parsing)
+with building and converting only a few selected subtrees (`extract` without parsing).
+Parsing is done once and not measured; results are checked to be equal.
+
+    python benchmarks/extract.py [statements] [depth] [paths]
+"""
+from __future__ import annotations
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tree import generate
+from wtfl.extract import ExtractReader, Selection, resolve
+from wtfl.parser import parse
+from wtfl.reader import Reader, Store
+
+
+def main(statements: int = 2000, depth: int = 4, paths: int = 3) -> None:
+    logging.disable(logging.WARNING)
+
+    document = generate(0, statements, depth)
+    tree = parse(document, (None, None, None, None))
+    expected = Reader().read_tree(tree).to_dict()
+    assert isinstance(expected, dict)
+
+    keys = [key for key in expected if key.startswith("block")][:: statements // paths][:paths]
+    selection = Selection([[key] for key in keys])
+
+    def full() -> None:
+        Reader().read_tree(tree).to_dict()
+
+    def selected() -> None:
+        state = ExtractReader(selection).read_tree(tree)
+        for key in keys:
+            value = resolve(state.keys, [key])
+            assert isinstance(value, Store)
+            assert value.to_python_value() == expected[key]
+
+    selected()
+
+    full_time = min(timeit.repeat(full, number=5, repeat=5)) / 5
+    selected_time = min(timeit.repeat(selected, number=5, repeat=5)) / 5
+
+    print(f"{statements} statements, depth {depth}, {len(keys)} paths")
+    print(f"    loads: {full_time * 1e3:8.2f} ms")
+    print(f"  extract: {selected_time * 1e3:8.2f} ms  {full_time / selected_time:5.0f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:4]))
@@ -0,0 +1,102 @@
+"""
+Compares editing an `IncrementalDocument` with loading the edited text again.
+Every edit replaces one random line with a line from another document;
+the time of the edit alone and of the edit with `to_python_value` is reported.
+Results are checked against `wtfl.loads` after every edit.
+
+    python benchmarks/incremental.py [statements] [edits] [shape]
+"""
+from __future__ import annotations
+import logging
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+import wtfl
+from wtfl.incremental import IncrementalDocument
+
+
+def median(values: List[float]) -> float:
+    return sorted(values)[len(values) // 2]
+
+
+def is_statement(line: str) -> bool:
+    """
+    True for a line that is a whole top-level statement
+    """
+    if not line[:1].isalpha():
+        return False
+
+    try:
+        wtfl.loads(line)
+    except ValueError:
+        return False
+
+    return True
+
+
+def outcome(func: Callable[[], object]) -> object:
+    try:
+        return func()
+    except ValueError as e:
+        return str(e)
+
+
+def main(statements: int = 20000, edits: int = 20, shape: str = "mixed") -> None:
+    logging.disable(logging.WARNING)
+    rng = random.Random(0)
+
+    document = generate(0, statements, shape)
+    replacements = [
+        line for line in generate(1, 200, shape).splitlines(keepends=True) if is_statement(line)
+    ]
+
+    started = time.perf_counter()
+    incremental = IncrementalDocument(document)
+    incremental.to_python_value()
+    initial = time.perf_counter() - started
+
+    edit_times: List[float] = []
+    value_times: List[float] = []
+    load_times: List[float] = []
+
+    for _ in range(edits):
+        text = incremental.text
+        lines = text.splitlines(keepends=True)
+        index = rng.randrange(len(lines))
+
+        # only whole statements are replaced, so the edited text stays valid
+        while not is_statement(lines[index]):
+            index = rng.randrange(len(lines))
+
+        start = sum(map(len, lines[:index]))
+
+        started = time.perf_counter()
+        incremental.edit(start, start + len(lines[index]), rng.choice(replacements))
+        edited = time.perf_counter()
+        result = outcome(incremental.to_python_value)
+        finished = time.perf_counter()
+
+        # an edit can break a constraint, then both raise the same error
+        assert result == outcome(lambda: wtfl.loads(incremental.text))
+        load_times.append(time.perf_counter() - finished)
+
+        edit_times.append(edited - started)
+        value_times.append(finished - started)
+
+    loading = median(load_times)
+
+    print(f"{shape}, {statements} statements, {len(document) / 1e6:.1f} MB, {len(incremental)} segments")
+    print(f"{'initial':>22}: {initial * 1e3:9.1f} ms")
+    print(f"{'loads after edit':>22}: {loading * 1e3:9.1f} ms")
+    print(f"{'edit':>22}: {median(edit_times) * 1e3:9.1f} ms  {loading / median(edit_times):6.1f}x")
+    print(f"{'edit + to_python_value':>22}: {median(value_times) * 1e3:9.1f} ms  {loading / median(value_times):6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]), *sys.argv[3:4])
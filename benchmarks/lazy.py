@@ -0,0 +1,46 @@
+"""
+Compares converting a whole loaded document into dicts and lists (`loads`)
+with reading a few keys through the views returned by `loads(..., lazy=True)`.
+Parsing and applying statements is done once and not measured.
+
+    python benchmarks/lazy.py [statements] [depth]
+"""
+from __future__ import annotations
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tree import generate
+from wtfl.parser import parse
+from wtfl.reader import Reader, StoreMapping
+
+
+def main(statements: int = 2000, depth: int = 4) -> None:
+    logging.disable(logging.WARNING)
+
+    document = generate(0, statements, depth)
+    state = Reader().read_tree(parse(document, (None, None, None, None)))
+    expected = state.to_dict()
+    assert isinstance(expected, dict)
+    keys = list(expected)[:: max(1, len(expected) // 3)][:3]
+
+    def lazy() -> None:
+        view = StoreMapping(state.keys)
+        for key in keys:
+            view[key]
+
+    assert StoreMapping(state.keys) == expected
+
+    eager_time = min(timeit.repeat(state.to_dict, number=10, repeat=5)) / 10
+    lazy_time = min(timeit.repeat(lazy, number=10, repeat=5)) / 10
+
+    print(f"{statements} statements, depth {depth}, reading {len(keys)} keys")
+    print(f"to_dict: {eager_time * 1e3:8.3f} ms")
+    print(f"   lazy: {lazy_time * 1e3:8.3f} ms  {eager_time / lazy_time:6.0f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
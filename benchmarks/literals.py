@@ -0,0 +1,91 @@
+"""
+Times conversion of every literal kind: the conversion function alone
+(and the previous implementation where it changed) and a whole `wtfl.loads`
+of a document made of that literal.
+
+    python benchmarks/literals.py [statements]
+"""
+from __future__ import annotations
+import codecs
+import os
+import sys
+import timeit
+from typing import Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wtfl
+from wtfl import literals
+
+
+def legacy_string(literal: str) -> str:
+    decoder = codecs.getdecoder("unicode_escape")
+    return decoder(literal[1:-1])[0]
+
+
+def legacy_numbers(s: str) -> int:
+    if s[1] == "u":
+        return len(s) - 2
+
+    bases = {
+        "b": 2,
+        "o": 8,
+        "d": 10,
+        "z": 12,
+        "v": 20,
+    }
+    return int(s[2:], bases[s[1]])
+
+
+# kind -> (literal, conversion, previous conversion)
+Kind = Tuple[str, Callable[[str], object], Optional[Callable[[str], object]]]
+
+KINDS: Dict[str, Kind] = {
+    "string": ('"just a plain string value"', literals.decode_string, legacy_string),
+    "escaped string": ('"tab\\there, quote \\" and \\u00e9"', literals.decode_string, legacy_string),
+    "integer": ("123456", literals.parse_int, None),
+    "float": ("1234.5678", literals.parse_float, None),
+    "exponent": ("1.5e-3", literals.parse_float, None),
+    "binary": ("0b101101", literals.parse_numbers, legacy_numbers),
+    "octal": ("0o755", literals.parse_numbers, legacy_numbers),
+    "duodecimal": ("0z9a1", literals.parse_numbers, legacy_numbers),
+    "vigesimal": ("0vjija", literals.parse_numbers, legacy_numbers),
+    "hexadecimal": ("0x1f_ff", literals.parse_numbers, None),
+    "unary": ("0u1111111", literals.parse_numbers, legacy_numbers),
+    "roman": ("0rMMXXIII", literals.parse_roman, None),
+    # interning costs a lookup, but repeated keys share one string in every Store
+    "key": ("some_key_name", literals.key_name, str),
+}
+
+
+def per_call(func: Callable[[str], object], literal: str) -> float:
+    number = 100000
+    return min(timeit.repeat(lambda: func(literal), number=number, repeat=5)) / number
+
+
+def document(kind: str, literal: str, statements: int) -> str:
+    if kind == "key":
+        return "\n".join(f"{literal} of item{i} is {i}" for i in range(statements))
+    return "\n".join(f"item{i} is {literal}" for i in range(statements))
+
+
+def main(statements: int = 2000) -> None:
+    wtfl.loads("warm is 1")
+
+    print(f"{'kind':<15} {'convert ns':>12} {'previous ns':>12} {'loads ms':>10}")
+
+    for kind, (literal, convert, legacy) in KINDS.items():
+        if legacy is not None:
+            assert convert(literal) == legacy(literal), kind
+
+        current = per_call(convert, literal)
+        previous = f"{per_call(legacy, literal) * 1e9:12.0f}" if legacy else f"{'-':>12}"
+
+        source = document(kind, literal, statements)
+        loading = min(timeit.repeat(lambda: wtfl.loads(source), number=1, repeat=3))
+
+        print(f"{kind:<15} {current * 1e9:12.0f} {previous} {loading * 1e3:10.1f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,90 @@
+"""
+Compares `wtfl.loads` with `wtfl.loads_parallel` on one large document
+for 1, 2, 4... worker processes (up to the number of cores, or the given maximum).
+Pools are started before measuring; results are checked to be equal, also with
+a spawned pool (own array markers in workers) and for documents that can't be
+cut after `key can't be` (the next line is its value).
+
+    python benchmarks/parallel.py [statements] [max workers] [shape]
+"""
+from __future__ import annotations
+import logging
+import multiprocessing
+import os
+import sys
+import timeit
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+import wtfl
+from wtfl.reader import PythonValue
+
+# every part of these can be parsed on its own, but not the whole document
+OPEN_ENDS = [
+    "k1 is 1\nx can't be\n5 is 3\nk2 is 2\n",
+    "k1 is 1\nx can be ...comment\n\ntrue is 3\nk2 is 2\n",
+    "k1 is 1\nx of y cannot be\n\"z\" is 3\nk2 is 2\n",
+]
+
+
+def outcome(load: Callable[[str], PythonValue], document: str) -> Tuple[str, PythonValue]:
+    try:
+        return "value", load(document)
+    except ValueError as e:
+        return "error", str(e)
+
+
+def check_equal(executor: Executor) -> None:
+    for shape in ("arrays", "mixed"):
+        document = generate(1, 2000, shape)
+        assert wtfl.loads_parallel(document, executor=executor) == wtfl.loads(document), shape
+
+    for document in OPEN_ENDS:
+        for parts in range(2, 8):
+            parallel = outcome(lambda s: wtfl.loads_parallel(s, executor=executor, parts=parts), document)
+            assert parallel == outcome(wtfl.loads, document), (document, parts, parallel)
+
+
+def main(statements: int = 20000, max_workers: int = 0, shape: str = "mixed") -> None:
+    logging.disable(logging.WARNING)
+
+    document = generate(0, statements, shape)
+    expected = wtfl.loads(document)
+    serial = min(timeit.repeat(lambda: wtfl.loads(document), number=1, repeat=3))
+
+    print(f"{shape}, {statements} statements, {len(document) / 1e6:.1f} MB, {os.cpu_count()} cores")
+    print(f"{'serial':>10}: {serial * 1e3:9.1f} ms")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    workers = 1
+
+    while workers <= max_workers:
+        with ProcessPoolExecutor(workers) as pool:
+            # starts the processes and builds their parsers
+            list(pool.map(wtfl.loads, ["warm is 1"] * workers))
+
+            result = wtfl.loads_parallel(document, executor=pool, workers=workers)
+            assert result == expected
+
+            elapsed = min(
+                timeit.repeat(
+                    lambda: wtfl.loads_parallel(document, executor=pool, workers=workers),
+                    number=1,
+                    repeat=3,
+                )
+            )
+
+        print(f"{workers:>2} workers: {elapsed * 1e3:9.1f} ms  {serial / elapsed:5.2f}x")
+        workers *= 2
+
+    for method in ("fork", "spawn"):
+        if method in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context(method)) as pool:
+                check_equal(pool)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]), *sys.argv[3:4])
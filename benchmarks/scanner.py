@@ -0,0 +1,92 @@
+"""
+Checks the `wtfl` scanner token-for-token against Lark's contextual lexer
+on generated documents and compares parsing throughput of both backends.
+
+    python benchmarks/scanner.py [documents] [statements]
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+from wtfl.parser import LexerName, get_parser, parse
+
+TokenInfo = Tuple[str, str, int, int, int, int, int, int]
+
+BROKEN = [
+    "x is",
+    "x is @",
+    "island is 5",
+    "x is has\n 1\n -3\nthat",
+    "key is 1\n\n  ... comment\n  is is",
+]
+
+
+def tokens(lexer: LexerName, document: str) -> List[TokenInfo]:
+    interactive = get_parser(lexer).parse_interactive(document)
+    return [
+        (
+            t.type,
+            t.value,
+            t.start_pos,
+            t.line,
+            t.column,
+            t.end_line,
+            t.end_column,
+            t.end_pos,
+        )
+        for t in interactive.iter_parse()
+    ]
+
+
+def error(lexer: LexerName, document: str) -> str:
+    try:
+        parse(document, (None, None, None, None), lexer)
+    except ValueError as e:
+        return str(e)
+    return ""
+
+
+def verify(documents: List[str]) -> None:
+    for i, document in enumerate(documents):
+        expected = tokens("contextual", document)
+        actual = tokens("wtfl", document)
+        if expected != actual:
+            mismatch = next(
+                (pair for pair in zip(expected, actual) if pair[0] != pair[1]),
+                (len(expected), len(actual)),
+            )
+            raise AssertionError(f"document {i}: {mismatch}")
+
+    for document in BROKEN:
+        assert error("contextual", document) == error("wtfl", document), document
+
+
+def throughput(lexer: LexerName, documents: List[str]) -> float:
+    size = sum(len(document.encode()) for document in documents)
+    parser = get_parser(lexer)
+
+    start = time.perf_counter()
+    for document in documents:
+        parser.parse(document)
+
+    return size / (time.perf_counter() - start) / 1e6
+
+
+def main(count: int = 20, statements: int = 2000) -> None:
+    documents = [generate(seed, statements) for seed in range(count)]
+
+    verify(documents)
+    total = sum(map(len, documents))
+    print(f"{count} documents, {total} characters: tokens match")
+
+    for lexer in ("contextual", "wtfl"):
+        print(f"{lexer:>10}: {throughput(lexer, documents):6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
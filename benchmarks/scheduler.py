@@ -0,0 +1,98 @@
+"""
+Checks the time travel scheduler against the sort-based ordering it replaced
+on random documents full of chained `return` / `skip` / `stay`,
+then compares the time both take to order the operations.
+
+    python benchmarks/scheduler.py [documents] [statements]
+"""
+from __future__ import annotations
+import os
+import random
+import sys
+import timeit
+from typing import List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import corpus
+from wtfl.internal_types import Operation
+from wtfl.parser import parse
+from wtfl.reader import Reader
+from wtfl.scheduler import Schedule
+
+
+def travel(rng: random.Random, statements: int) -> str:
+    kind = rng.choice(["return", "skip", "stay"])
+    if kind == "stay":
+        return "stay"
+    # sometimes far outside of the document
+    distance = rng.randrange(statements * 2) if rng.random() < 0.2 else rng.randrange(4)
+    return f"{kind} {distance}"
+
+
+def generate(seed: int, statements: int) -> str:
+    rng = random.Random(seed)
+    lines = []
+
+    for i in range(statements):
+        chain = "".join(f"{travel(rng, statements)} and " for _ in range(rng.randint(0, 3)))
+        roll = rng.random()
+
+        if roll < 0.7:
+            line = f"key{rng.randrange(20)} is {i}"
+        elif roll < 0.85:
+            line = f"block{i} is has\n  x is {i}\n  y is {i}\nthat"
+        else:
+            line = f"key{rng.randrange(20)} can be {i}"
+
+        lines.append(chain + line)
+
+    return "\n".join(lines) + "\n"
+
+
+def timeline(document: str) -> List[Sequence[Operation]]:
+    reader = Reader()
+    return [reader.process_operation(op) for op in parse(document, (None,) * 4)]
+
+
+def sort_order(statements: List[Sequence[Operation]]) -> List[Operation]:
+    """the ordering used before the scheduler"""
+    flat: List[Tuple[Operation, int]] = [
+        (op, i) for i, operations in enumerate(statements) for op in operations
+    ]
+
+    def key_func(statement: Tuple[Operation, int]) -> float:
+        [operation, index] = statement
+
+        if operation.offset:
+            return index + operation.offset - 1 / 100000
+
+        return index
+
+    return [op for op, _ in sorted(flat, key=key_func)]
+
+
+def main(documents: int = 200, statements: int = 200) -> None:
+    for seed in range(documents):
+        statements_ = timeline(generate(seed, statements))
+        expected = sort_order(statements_)
+        result = list(Schedule(statements_))
+        assert [id(op) for op in result] == [id(op) for op in expected], seed
+
+    print(f"{documents} documents: same order")
+
+    documents_ = {
+        "time travel heavy": generate(documents, statements * 100),
+        "regular": corpus.generate(documents, statements * 100),
+    }
+
+    for title, document in documents_.items():
+        big = timeline(document)
+        print(f"{title}, {len(big)} statements:")
+
+        for name, order in (("sorted", sort_order), ("schedule", lambda s: Schedule(s).order())):
+            best = min(timeit.repeat(lambda: order(big), number=1, repeat=5))
+            print(f"{name:>10}: {best:.4f} s")
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
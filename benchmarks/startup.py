@@ -0,0 +1,68 @@
+"""
+Measures `import wtfl` and first `wtfl.loads` latency in a fresh interpreter,
+with a cold (empty) and a warm compiled-grammar cache.
+
+    python benchmarks/startup.py [runs]
+"""
+from __future__ import annotations
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import wtfl
+imported = time.perf_counter()
+wtfl.loads('weight of apple is 123')
+parsed = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_parse": parsed - imported}))
+"""
+
+
+def probe(cache_dir: str) -> Dict[str, float]:
+    env = dict(os.environ, WTFL_CACHE_DIR=cache_dir, PYTHONPATH=ROOT)
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def summary(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    return {
+        key: statistics.median(sample[key] for sample in samples) * 1000
+        for key in ("import", "first_parse")
+    }
+
+
+def main(runs: int = 5) -> None:
+    cold: List[Dict[str, float]] = []
+    warm: List[Dict[str, float]] = []
+
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(probe(cache_dir))
+            warm.append(probe(cache_dir))
+
+    print(f"median of {runs} runs, ms")
+    for name, samples in (("cold cache", cold), ("warm cache", warm)):
+        result = summary(samples)
+        print(
+            f"{name:>10}: import {result['import']:7.1f}"
+            f"  first parse {result['first_parse']:7.1f}"
+            f"  total {result['import'] + result['first_parse']:7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
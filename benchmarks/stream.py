@@ -0,0 +1,66 @@
+"""
+Compares `wtfl.load` with `wtfl.iterload` on a generated file:
+checks that both give the same result and reports time and peak traced memory.
+
+    python benchmarks/stream.py [statements] [seed]
+"""
+from __future__ import annotations
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate
+import wtfl
+from wtfl.reader import PythonValue, ReadState
+
+
+def measure(func: Callable[[], PythonValue]) -> Tuple[PythonValue, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(statements: int = 20000, seed: int = 0) -> None:
+    warnings.simplefilter("ignore")
+    wtfl.loads("warm is 1")  # build the parser outside of the measurement
+
+    with tempfile.NamedTemporaryFile("w", suffix=".wtfl", delete=False) as file:
+        file.write(generate(seed, statements))
+        path = file.name
+
+    def load() -> PythonValue:
+        with open(path) as file:
+            return wtfl.load(file)
+
+    def iterload() -> PythonValue:
+        state = ReadState()
+        with open(path) as file:
+            for _ in wtfl.iterload(file, state=state):
+                pass
+        return state.to_dict()
+
+    try:
+        expected, load_time, load_peak = measure(load)
+        result, stream_time, stream_peak = measure(iterload)
+    finally:
+        os.remove(path)
+
+    assert result == expected
+
+    print(f"{statements} statements")
+    print(f"load:     {load_time:7.3f} s, peak {load_peak / 2 ** 20:8.2f} MiB")
+    print(f"iterload: {stream_time:7.3f} s, peak {stream_peak / 2 ** 20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
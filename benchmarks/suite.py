@@ -0,0 +1,164 @@
+"""
+Runs `wtfl.loads` and `wtfl.dumps` on every corpus shape and reports
+throughput, latency percentiles and peak traced memory.
+Results are saved as JSON (to benchmarks/results/ by default), pass a previous
+results file to compare against it.
+
+    python benchmarks/suite.py [--statements N] [--repeat N] [--seed N]
+                               [--shapes mixed,wide,...] [--output FILE] [--compare FILE]
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import SHAPES, generate
+import wtfl
+
+Metrics = Dict[str, Union[int, float]]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """nearest-rank percentile"""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(func: Callable[[], object], size: int, repeat: int) -> Metrics:
+    """`size` is the number of characters processed by a single call"""
+    func()  # warm up
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    median = percentile(latencies, 0.5)
+
+    return {
+        "chars": size,
+        "mb_per_s": size / median / 1e6,
+        "p50_ms": median * 1e3,
+        "p90_ms": percentile(latencies, 0.9) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "min_ms": latencies[0] * 1e3,
+        "max_ms": latencies[-1] * 1e3,
+        "peak_memory_kib": peak_memory(func) / 1024,
+    }
+
+
+def run(shapes: List[str], statements: int, repeat: int, seed: int) -> Dict[str, Dict[str, Metrics]]:
+    results: Dict[str, Dict[str, Metrics]] = {}
+
+    for shape in shapes:
+        document = generate(seed, statements, shape)
+        obj = wtfl.loads(document)
+        output = wtfl.dumps(obj)
+
+        loads = measure(lambda: wtfl.loads(document), len(document), repeat)
+        loads["statements_per_s"] = statements / (loads["p50_ms"] / 1e3)
+        dumps = measure(lambda: wtfl.dumps(obj), len(output), repeat)
+
+        results[shape] = {"loads": loads, "dumps": dumps}
+
+    return results
+
+
+def print_table(
+    results: Dict[str, Dict[str, Metrics]],
+    baseline: Dict[str, Dict[str, Metrics]] | None,
+) -> None:
+    header = f"{'shape':<12} {'op':<6} {'MB/s':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak KiB':>10}"
+    if baseline is not None:
+        header += f" {'p50 vs baseline':>16}"
+    print(header)
+
+    for shape, operations in results.items():
+        for operation, metrics in operations.items():
+            line = (
+                f"{shape:<12} {operation:<6} {metrics['mb_per_s']:8.3f} {metrics['p50_ms']:9.2f}"
+                f" {metrics['p90_ms']:9.2f} {metrics['p99_ms']:9.2f} {metrics['peak_memory_kib']:10.0f}"
+            )
+
+            if baseline is not None:
+                previous = baseline.get(shape, {}).get(operation)
+                if previous:
+                    line += f" {metrics['p50_ms'] / previous['p50_ms']:15.2f}x"
+
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--statements", type=int, default=2000, help="statements per document")
+    parser.add_argument("--repeat", type=int, default=20, help="measured calls per document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated corpus shapes")
+    parser.add_argument(
+        "--output", help="results file (default: benchmarks/results/results-<version>.json)"
+    )
+    parser.add_argument("--compare", help="results file of a previous run to compare with")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # array hole warnings
+    wtfl.loads("warm is 1")  # build the parser outside of the measurement
+
+    shapes = args.shapes.split(",")
+    results = run(shapes, args.statements, args.repeat, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+    print_table(results, baseline)
+
+    output = args.output
+
+    if output is None:
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+        os.makedirs(directory, exist_ok=True)
+        output = os.path.join(directory, f"results-{wtfl.__version__}.json")
+
+    report = {
+        "version": wtfl.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "parameters": {
+            "statements": args.statements,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"\nsaved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Runs `wtfl.loads` from a thread pool with different number hooks per call,
+checks every result and reports throughput per worker count.
+On GIL builds of CPython the throughput stays flat: the point is that
+no external lock is needed and hooks of one call never leak into another.
+
+    python benchmarks/threads.py [documents]
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from fractions import Fraction
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wtfl
+
+DOCUMENT = "\n".join(
+    f"value of item{i} is {i}.5\ncount of item{i} is {i}\nroman of item{i} is 0rXIV\nbits of item{i} is 0b101"
+    for i in range(50)
+)
+
+Hooks = Dict[str, Callable[[str], object]]
+
+HOOKS: List[Tuple[Hooks, type]] = [
+    ({}, float),
+    ({"parse_float": Decimal}, Decimal),
+    ({"parse_float": Fraction}, Fraction),
+    ({"parse_float": str}, str),
+]
+
+
+def job(n: int) -> None:
+    hooks, float_type = HOOKS[n % len(HOOKS)]
+    result = wtfl.loads(DOCUMENT, **hooks)  # type: ignore
+    assert isinstance(result, dict)
+
+    for i in range(50):
+        item = result[f"item{i}"]
+        assert isinstance(item, dict)
+        assert type(item["value"]) is float_type, (hooks, item)
+        assert item["value"] == float_type(f"{i}.5")
+        assert item["count"] == i
+        assert item["roman"] == 14
+        assert item["bits"] == 5
+
+
+def run(workers: int, documents: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        for _ in pool.map(job, range(documents)):
+            pass
+    return documents / (time.perf_counter() - start)
+
+
+def main(documents: int = 400) -> None:
+    job(0)  # build the parser outside of the measurement
+
+    for workers in (1, 2, 4, 8):
+        print(f"{workers} workers: {run(workers, documents):8.1f} documents/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,62 @@
+"""
+Compares building the state straight from parsed objects (documents without
+time travel and constraints) with flattening every object into full paths first.
+Parsing is done once and not measured; both results are checked to be equal.
+
+    python benchmarks/tree.py [documents] [statements]
+"""
+from __future__ import annotations
+import logging
+import os
+import random
+import sys
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import block, key, value
+from wtfl.internal_types import Operation
+from wtfl.parser import parse
+from wtfl.reader import Reader
+
+
+class FlatteningReader(Reader):
+    def is_plain(self, tree: List[Operation]) -> bool:
+        return False
+
+
+def generate(seed: int, statements: int, depth: int) -> str:
+    """nested objects and arrays, no time travel and no constraints"""
+    rng = random.Random(seed)
+    lines = []
+
+    for i in range(statements):
+        if rng.random() < 0.3:
+            lines.append(f"{key(rng)} is {value(rng)}")
+        else:
+            lines.append(f"block{i} is {block(rng, '', depth)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def main(documents: int = 50, statements: int = 200) -> None:
+    logging.disable(logging.WARNING)  # array hole warnings
+
+    for seed in range(documents):
+        tree = parse(generate(seed, statements, 4), (None,) * 4)
+        assert Reader().read_tree(tree).to_dict() == FlatteningReader().read_tree(tree).to_dict()
+
+    print(f"{documents} documents: same result")
+
+    for depth in (2, 4, 8):
+        tree = parse(generate(depth, statements * 10, depth), (None,) * 4)
+        print(f"depth {depth}:")
+
+        for name, reader in (("direct", Reader()), ("flattening", FlatteningReader())):
+            best = min(timeit.repeat(lambda: reader.read_tree(tree), number=1, repeat=5))
+            print(f"{name:>12}: {best:.4f} s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
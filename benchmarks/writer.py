@@ -0,0 +1,168 @@
+"""
+Writer benchmarks:
+- `wtfl.dumps` against `wtfl.dump` into a file that discards its input (time and peak traced memory)
+- output size and time of `dumps(..., compact=True)`, with and without indentation, against the default
+- encoding time per KiB of output on deep and wide trees, which stays flat as depth grows,
+  compared (and checked byte for byte) with the previous encoder that re-indented every nested block
+
+    python benchmarks/writer.py [items]
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wtfl
+from wtfl import writer
+from wtfl.reader import PythonValue
+
+
+class Discard:
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+def sample(items: int) -> PythonValue:
+    return {
+        f"item{i}": {
+            "name": f"item number {i}",
+            "weight": i * 1.5,
+            "tags": ["a", "b", i],
+            "nested": {"deeper": {"flag": i % 2 == 0, "nothing": None}},
+        }
+        for i in range(items)
+    }
+
+
+def deep(depth: int, width: int) -> PythonValue:
+    """a chain of `depth` objects and arrays with a `width` wide object at the bottom"""
+    obj: PythonValue = {f"key{i}": f"value {i}" for i in range(width)}
+
+    for level in range(depth):
+        if level % 2:
+            obj = {"level": level, "child": obj}
+        else:
+            obj = [level, obj]
+
+    return obj
+
+
+def first(seq: Sequence[str]) -> str:
+    return seq[0]
+
+
+class Reindenting(writer.WTFLEncoder):
+    """the previous encoder: renders nested blocks to strings and re-indents them at every level"""
+
+    def add_tab(self, text: str) -> str:
+        if not (self.indent or text):
+            return text
+        return self.indent + text.replace("\n", "\n" + self.indent)
+
+    def make_list(self, obj: List[PythonValue]) -> str:
+        if not obj:
+            return f"{self.random_kw('have')} 0"
+
+        tail = f"{self.random_kw('that')}{self.also}"
+        entries = filter(None, map(self.dumps, obj))
+        result = [
+            self.random_kw("have"),
+            self.add_tab(self.statement_sep.join(entries)),
+            tail,
+        ]
+        return self.statement_sep.join(result)
+
+    def make_dict(self, obj: Dict[str, PythonValue], is_toplevel: bool = False) -> str:
+        sep = self.statement_sep * (1 + is_toplevel)
+        pairs = [(self.dumps(key), self.dumps(value)) for key, value in obj.items()]
+        entries = (f"{k}{self.random_kw('is')} {v}" for (k, v) in pairs if k and v)
+
+        if is_toplevel:
+            return sep.join(entries)
+
+        tail = f"{self.random_kw('that')}{self.also}"
+        result = [self.random_kw("have"), self.add_tab(sep.join(entries)), tail]
+        return sep.join(result)
+
+    def dumps(self, obj: PythonValue, is_toplevel: bool = False) -> str:
+        if isinstance(obj, list):
+            return self.make_list(obj)
+        if isinstance(obj, dict):
+            return self.make_dict(obj, is_toplevel)
+        return "".join(self.iterencode(obj))
+
+
+def measure(name: str, func: Callable[[], object]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>6}: {elapsed:7.3f} s, peak {peak / 2 ** 20:8.2f} MiB")
+
+
+def per_kib(func: Callable[[], str]) -> float:
+    size = len(func())
+    best = min(timeit.repeat(func, number=1, repeat=3))
+    return best * 1e6 / size * 1024
+
+
+def compare_compact(obj: PythonValue) -> None:
+    default = wtfl.dumps(obj)
+    default_time = min(timeit.repeat(lambda: wtfl.dumps(obj), number=1, repeat=3))
+
+    print(f"\n{'':>18} {'bytes':>10} {'ms':>8}")
+    print(f"{'default':>18} {len(default):10} {default_time * 1e3:8.1f}")
+
+    for indent in (2, 0):
+        output = wtfl.dumps(obj, compact=True, indent=indent)
+        assert output == wtfl.dumps(obj, compact=True, indent=indent)
+        assert wtfl.loads(output) == obj
+
+        elapsed = min(timeit.repeat(lambda: wtfl.dumps(obj, compact=True, indent=indent), number=1, repeat=3))
+        print(
+            f"{f'compact, indent={indent}':>18} {len(output):10} {elapsed * 1e3:8.1f}"
+            f"  {len(output) / len(default):5.0%} size, {default_time / elapsed:4.2f}x faster"
+        )
+
+
+def main(items: int = 20000) -> None:
+    obj = sample(items)
+    print(f"{len(wtfl.dumps(obj)) / 2 ** 20:.2f} MiB of output")
+
+    measure("dumps", lambda: wtfl.dumps(obj))
+    measure("dump", lambda: wtfl.dump(Discard(), obj))
+
+    compare_compact(obj)
+
+    writer.random.choice = first  # type: ignore
+
+    sys.setrecursionlimit(10000)
+
+    print("\n depth  width  output KiB   wtfl us/KiB   re-indenting us/KiB")
+    shapes: List[Dict[str, int]] = [
+        {"depth": depth, "width": width}
+        for depth in (10, 100, 1000)
+        for width in (10, 1000)
+    ]
+
+    for shape in shapes:
+        tree = deep(**shape)
+        output = wtfl.dumps(tree)
+        assert output == Reindenting().dumps(tree, True), shape
+
+        print(
+            f"{shape['depth']:6} {shape['width']:6} {len(output) / 1024:11.1f}"
+            f" {per_kib(lambda: wtfl.dumps(tree)):13.1f}"
+            f" {per_kib(lambda: Reindenting().dumps(tree, True)):20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -1,2 +1,27 @@
-from .reader import load as load, loads as loads
+from .reader import iterload as iterload, load as load, loads as loads
+from .appender import WTFLAppender as WTFLAppender
+from .batch import (
+    iter_load_paths as iter_load_paths,
+    iter_loads_many as iter_loads_many,
+    load_paths as load_paths,
+    loads_many as loads_many,
+)
+from .check import check as check
+from .compaction import compact as compact
+from .compiled import compile_file as compile_file, load_compiled as load_compiled
+from .extract import extract as extract
+from .incremental import IncrementalDocument as IncrementalDocument
+from .parallel import loads_parallel as loads_parallel
+from .result_cache import LoadCache as LoadCache
+from .stats import LoadStats as LoadStats
+from .version import package_version
+from .watch import Watcher as Watcher
 from .writer import dump as dump, dumps as dumps
+
+
+def __getattr__(name: str) -> str:
+    # `__version__` is read from the package metadata on first use, which is slow to do on import
+    if name == "__version__":
+        return package_version()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,131 @@
+from __future__ import annotations
+import io
+import os
+import threading
+from typing import Callable, List, Union
+
+from .extract import PathSpec, split_path
+from .reader import PythonValue
+from .writer import WTFLEncoder
+
+Path = Union[str, "os.PathLike[str]"]
+
+
+def ends_with_newline(path: str) -> bool:
+    """
+    True for an empty file too
+    """
+    with open(path, "rb") as file:
+        if not file.seek(0, io.SEEK_END):
+            return True
+
+        file.seek(-1, io.SEEK_END)
+        return file.read(1) == b"\n"
+
+
+class WTFLAppender:
+    """
+    Appends `key of ... is value` statements to a file, so a document can be used as a log of changes:
+    the last assignment to a key wins, and saving a change doesn't rewrite the file.
+
+    Statements are buffered until `buffer_size` characters are waiting, `flush` or `close`.
+    With `fsync=True`, every flush also waits until the data is on disk
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        buffer_size: int = 65536,
+        fsync: bool = False,
+        skipkeys: bool = False,
+        ensure_ascii: bool = True,
+        indent: int | str = 2,
+        default: Callable[[object], str] | None = None,
+        sort_keys: bool = False,
+        compact: bool = True,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.buffer_size = buffer_size
+        self.fsync = fsync
+        self.encoder = WTFLEncoder(
+            skipkeys=skipkeys,
+            ensure_ascii=ensure_ascii,
+            indent=indent,
+            default=default,
+            sort_keys=sort_keys,
+            compact=compact,
+        )
+
+        self.buffer: List[str] = []
+        self.buffered = 0
+        self.lock = threading.Lock()
+
+        self.file = open(self.path, "a", encoding="utf-8")
+
+        # the last statement of the file has to end before a new one starts
+        if not ends_with_newline(self.path):
+            self.buffer.append("\n")
+
+    def encode(self, path: PathSpec, value: PythonValue) -> str:
+        """
+        Statements that make `path` equal to `value`, an empty string if the value is skipped
+        """
+        chain = split_path(path)
+
+        if not chain:
+            raise ValueError("Empty path")
+
+        key = " of ".join(self.encoder.encode_key(key) for key in reversed(chain))
+        assign = f"{key}{self.encoder.keyword('is')} "
+        encoded = "".join(self.encoder.iterencode(value))
+
+        if not encoded:
+            return ""
+
+        if isinstance(value, list) or (isinstance(value, dict) and value):
+            # objects and arrays are merged with the previous value, an empty object replaces it first
+            return f"{assign}{self.encoder.dumps({})}\n{assign}{encoded}\n"
+
+        return f"{assign}{encoded}\n"
+
+    def set(self, path: PathSpec, value: PythonValue) -> None:
+        """
+        Appends an assignment of `value` to `path` ("weight of apple", or keys from the outermost one).
+        Like in WTFL, a value can't be set inside a value that is not an object
+        """
+        statement = self.encode(path, value)
+
+        with self.lock:
+            self.buffer.append(statement)
+            self.buffered += len(statement)
+
+            if self.buffered >= self.buffer_size:
+                self.write()
+
+    def write(self) -> None:
+        self.file.write("".join(self.buffer))
+        self.buffer.clear()
+        self.buffered = 0
+        self.file.flush()
+
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def flush(self) -> None:
+        with self.lock:
+            self.write()
+
+    def close(self) -> None:
+        with self.lock:
+            if self.file.closed:
+                return
+
+            self.write()
+            self.file.close()
+
+    def __enter__(self) -> WTFLAppender:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
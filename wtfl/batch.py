@@ -0,0 +1,261 @@
+from __future__ import annotations
+import os
+import pickle
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Deque, Iterable, Iterator, List, Tuple, Union
+
+from typing_extensions import Literal
+
+from .parser import LexerName, ParseFunc, ParseFuncs
+from .reader import PythonValue, loads
+
+Path = Union[str, "os.PathLike[str]"]
+PoolKind = Literal["thread", "process"]
+Outcome = Tuple[PythonValue, Union[Exception, None]]
+
+
+class BatchResult:
+    """
+    Result of a single document of a batch: `value` if it loaded, `error` otherwise
+    """
+
+    def __init__(
+        self,
+        index: int,
+        source: str | None,
+        value: PythonValue,
+        error: Exception | None,
+    ) -> None:
+        self.index = index
+        # path of the document, None for strings
+        self.source = source
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> PythonValue:
+        """
+        Returns the value or raises the error
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self) -> str:
+        result = f"error={self.error!r}" if self.error is not None else f"value={self.value!r}"
+        return f"BatchResult(index={self.index}, source={self.source!r}, {result})"
+
+
+class WorkerError(Exception):
+    """
+    Stands for an error that can't be sent back from a worker process (its arguments don't unpickle),
+    with the name of its type and its message
+    """
+
+    def __init__(self, type_name: str, message: str) -> None:
+        super().__init__(type_name, message)
+        self.type_name = type_name
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.type_name}: {self.message}"
+
+
+def portable(error: Exception) -> Exception:
+    """
+    The error if it survives pickling, WorkerError otherwise.
+    Errors of a process pool are unpickled in the parent, and one that fails breaks the pool
+    """
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return WorkerError(type(error).__qualname__, str(error))
+
+    return error
+
+
+def fspath(path: Path) -> str:
+    return os.fspath(path)
+
+
+def load_document(s: str, parse_funcs: ParseFuncs, lexer: LexerName, remote: bool = False) -> Outcome:
+    """
+    With `remote`, the error is replaced with WorkerError if it can't be sent to another process
+    """
+    try:
+        value = loads(
+            s,
+            parse_float=parse_funcs[0],
+            parse_int=parse_funcs[1],
+            parse_roman=parse_funcs[2],
+            parse_numbers=parse_funcs[3],
+            lexer=lexer,
+        )
+    except Exception as e:
+        return None, portable(e) if remote else e
+
+    return value, None
+
+
+def load_path(path: str, parse_funcs: ParseFuncs, lexer: LexerName, remote: bool = False) -> Outcome:
+    try:
+        with open(path, encoding="utf-8") as file:
+            s = file.read()
+    except OSError as e:
+        return None, portable(e) if remote else e
+
+    return load_document(s, parse_funcs, lexer, remote)
+
+
+def iter_batch(
+    documents: Iterable[str],
+    are_paths: bool,
+    parse_funcs: ParseFuncs,
+    lexer: LexerName,
+    workers: int | None,
+    pool: PoolKind,
+    executor: Executor | None,
+) -> Iterator[BatchResult]:
+    # pools are imported on use, the process one imports multiprocessing, which is slow
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if executor is None:
+        workers = workers or os.cpu_count() or 1
+        own: Executor = (
+            ProcessPoolExecutor(workers) if pool == "process" else ThreadPoolExecutor(workers)
+        )
+
+        with own:
+            yield from iter_batch(documents, are_paths, parse_funcs, lexer, workers, pool, own)
+        return
+
+    load = load_path if are_paths else load_document
+    remote = isinstance(executor, ProcessPoolExecutor)
+    # documents are submitted a few at a time, so a huge batch is never in memory at once
+    ahead = (workers or os.cpu_count() or 1) * 4
+    pending: Deque[Tuple[int, str | None, Future[Outcome]]] = deque()
+
+    for index, document in enumerate(documents):
+        source = document if are_paths else None
+        pending.append((index, source, executor.submit(load, document, parse_funcs, lexer, remote)))
+
+        if len(pending) >= ahead:
+            yield finish(*pending.popleft())
+
+    while pending:
+        yield finish(*pending.popleft())
+
+
+def finish(index: int, source: str | None, future: Future[Outcome]) -> BatchResult:
+    value, error = future.result()
+    return BatchResult(index, source, value, error)
+
+
+def iter_loads_many(
+    documents: Iterable[str],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    workers: int | None = None,
+    pool: PoolKind = "thread",
+    executor: Executor | None = None,
+) -> Iterator[BatchResult]:
+    """
+    Loads documents in a pool, yielding a BatchResult for each of them in input order
+    """
+    return iter_batch(
+        documents,
+        False,
+        (parse_float, parse_int, parse_roman, parse_numbers),
+        lexer,
+        workers,
+        pool,
+        executor,
+    )
+
+
+def loads_many(
+    documents: Iterable[str],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    workers: int | None = None,
+    pool: PoolKind = "thread",
+    executor: Executor | None = None,
+) -> List[BatchResult]:
+    return list(
+        iter_loads_many(
+            documents,
+            parse_float=parse_float,
+            parse_int=parse_int,
+            parse_roman=parse_roman,
+            parse_numbers=parse_numbers,
+            lexer=lexer,
+            workers=workers,
+            pool=pool,
+            executor=executor,
+        )
+    )
+
+
+def iter_load_paths(
+    paths: Iterable[Path],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    workers: int | None = None,
+    pool: PoolKind = "thread",
+    executor: Executor | None = None,
+) -> Iterator[BatchResult]:
+    """
+    Same as `iter_loads_many`, but for paths. Files are read in the pool too
+    """
+    return iter_batch(
+        map(fspath, paths),
+        True,
+        (parse_float, parse_int, parse_roman, parse_numbers),
+        lexer,
+        workers,
+        pool,
+        executor,
+    )
+
+
+def load_paths(
+    paths: Iterable[Path],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    workers: int | None = None,
+    pool: PoolKind = "thread",
+    executor: Executor | None = None,
+) -> List[BatchResult]:
+    return list(
+        iter_load_paths(
+            paths,
+            parse_float=parse_float,
+            parse_int=parse_int,
+            parse_roman=parse_roman,
+            parse_numbers=parse_numbers,
+            lexer=lexer,
+            workers=workers,
+            pool=pool,
+            executor=executor,
+        )
+    )
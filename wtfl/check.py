@@ -0,0 +1,170 @@
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
+
+from typing_extensions import Literal
+
+from .internal_types import Assign, Constraint, KeyChain, Object, Operation, Value
+from .parser import LexerName, ParseError, ParseFunc, ParseFuncs, parse, parse_located
+from .reader import ReadState, Reader, ResolvingError, Store
+from .scheduler import Schedule
+
+Severity = Literal["error", "warning"]
+Path = Tuple[str, ...]
+
+
+class Diagnostic:
+    """
+    A problem found by `check`. Line and column (1-based) are of the problem itself for syntax errors,
+    of the top-level statement it comes from for others
+    """
+
+    def __init__(self, line: int, column: int, message: str, severity: Severity = "error") -> None:
+        self.line = line
+        self.column = column
+        self.message = message
+        self.severity: Severity = severity
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "line": self.line,
+            "column": self.column,
+            "message": self.message,
+            "severity": self.severity,
+        }
+
+    def __str__(self) -> str:
+        return f"{self.line}:{self.column}: {self.severity}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"Diagnostic({self})"
+
+
+class CheckState(ReadState):
+    """
+    ReadState that records errors instead of raising them and keeps values only where constraints look at them
+    (children of constrained paths, see `add_constraint`), other values are replaced with None
+    """
+
+    def __init__(self, needed: Set[Path]) -> None:
+        super().__init__()
+        self.needed = needed
+        # index of the top-level statement being applied
+        self.statement = 0
+        self.problems: List[Tuple[int, str, Severity]] = []
+
+    def report(self, message: str, severity: Severity = "error") -> None:
+        self.problems.append((self.statement, message, severity))
+
+    def assign(self, op: Assign):
+        try:
+            super().assign(op)
+        except ValueError as e:
+            self.report(describe(e))
+
+    def assign_tree(self, op: Assign):
+        try:
+            super().assign_tree(op)
+        except ValueError as e:
+            self.report(describe(e))
+
+    def assign_path(self, path: KeyChain, value: Value):
+        if not isinstance(value, Object) and tuple(path[:-1]) not in self.needed:
+            value = None
+
+        super().assign_path(path, value)
+
+    def assign_nested(self, store: Store, op: Assign, prefix: KeyChain):
+        if isinstance(op.value, Object) or tuple(prefix + op.key[:-1]) in self.needed:
+            super().assign_nested(store, op, prefix)
+            return
+
+        parent = self.descend(store, op.key[:-1], prefix)
+        parent[op.key[-1]] = None
+
+    def too_late(self, constraint: Constraint):
+        self.report(f"{constraint.key_repr()} is constrained after a value it doesn't allow", "warning")
+
+
+def describe(error: ValueError) -> str:
+    if isinstance(error, ResolvingError):
+        return f"{error.key!r} is not an object, nothing can be set inside it"
+
+    return str(error)
+
+
+class CheckReader(Reader):
+    def read_checked(self, tree: List[Operation]) -> CheckState:
+        state = CheckState({op.key for op in tree if isinstance(op, Constraint)})
+
+        if self.is_plain(tree):
+            for index, operation in enumerate(tree):
+                if isinstance(operation, Assign):
+                    state.statement = index
+                    state.assign_tree(operation)
+            return state
+
+        timeline = [self.process_operation(operation) for operation in tree]
+        # operations are unwound, find their statements by identity
+        origins = {
+            id(operation): index
+            for index, operations in enumerate(timeline)
+            for operation in operations
+        }
+
+        for operation in Schedule(timeline):
+            state.statement = origins[id(operation)]
+            self.apply_operation(operation, state)
+
+        return state
+
+
+def check(
+    s: str,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+) -> List[Diagnostic]:
+    """
+    Checks that a document parses and its values pass its constraints, without building the value.
+    Returns the problems found, an empty list if `loads` would succeed
+    """
+    parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+
+    try:
+        tree = parse(s, parse_funcs, lexer)
+    except ParseError as e:
+        text = repr(e.text) if e.text else "end of document"
+        return [Diagnostic(e.line, e.column, f"{e.reason}: {text}")]
+
+    state = CheckReader().read_checked(tree)
+
+    if not state.problems:
+        return []
+
+    # positions are only needed to report problems, parsing with them is slower
+    _, positions = parse_located(s, parse_funcs, lexer)
+
+    return [
+        Diagnostic(*positions[statement], message, severity)
+        for statement, message, severity in state.problems
+    ]
+
+
+def main(paths: List[str]) -> int:
+    """
+    Checks files, prints their problems. Returns 1 if there were errors
+    """
+    failed = False
+
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            diagnostics = check(file.read())
+
+        for diagnostic in diagnostics:
+            print(f"{path}:{diagnostic}")
+            failed = failed or diagnostic.severity == "error"
+
+    return int(failed)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import os
+from typing import List, Set, Tuple, Union
+
+from .grammar_cache import replace_file
+from .internal_types import Constraint, Object
+from .parser import LexerName
+from .reader import PythonValue, ReadState, TimedReader
+from .stats import LoadStats
+from .writer import WTFLEncoder
+
+Path = Union[str, "os.PathLike[str]"]
+
+# constraints that can reject a value, `can be` and `can be <value>` allow everything
+_restrictive = {"hastobe", "cantbe", "cant_exist"}
+
+
+class CompactReport:
+    """
+    Sizes (in bytes), load times (in seconds) and statement counts of a document before and after `compact`
+    """
+
+    def __init__(
+        self,
+        source_size: int,
+        compacted_size: int,
+        source_stats: LoadStats,
+        compacted_stats: LoadStats,
+        constraints: int,
+    ) -> None:
+        self.source_size = source_size
+        self.compacted_size = compacted_size
+        self.source_time = source_stats.total
+        self.compacted_time = compacted_stats.total
+        self.source_statements = source_stats.statements
+        self.compacted_statements = compacted_stats.statements
+        # constraints kept in the compacted document
+        self.constraints = constraints
+
+    @property
+    def size_reduction(self) -> float:
+        return 1 - self.compacted_size / self.source_size if self.source_size else 0.0
+
+    @property
+    def load_time_reduction(self) -> float:
+        return 1 - self.compacted_time / self.source_time if self.source_time else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactReport({self.source_size} -> {self.compacted_size} bytes, "
+            f"{self.source_statements} -> {self.compacted_statements} statements, "
+            f"{self.source_time * 1e3:.1f} -> {self.compacted_time * 1e3:.1f} ms)"
+        )
+
+
+def restrictive_constraints(state: ReadState) -> List[Constraint]:
+    """
+    Constraints of a loaded document that can still reject a value, without repeated ones
+    """
+    result: List[Constraint] = []
+    seen: Set[Tuple[str, Tuple[str, ...], type, object]] = set()
+
+    for by_path in state.constraints.names.values():
+        for path_constraints in by_path.values():
+            for constraint in path_constraints.constraints:
+                key = (constraint.ctype, constraint.key, type(constraint.value), constraint.value)
+
+                if constraint.ctype in _restrictive and key not in seen:
+                    seen.add(key)
+                    result.append(constraint)
+
+    return result
+
+
+def encode_constraint(encoder: WTFLEncoder, constraint: Constraint) -> str | None:
+    """
+    Statement of a constraint, None if its value can't be written
+    """
+    key = " of ".join(encoder.encode_key(key) for key in reversed(constraint.key))
+
+    if constraint.ctype == "cant_exist":
+        # without `also`, the key of the next statement would be read as a value
+        return f"{key} can't be also"
+
+    if isinstance(constraint.value, Object):
+        return None
+
+    value = encoder.encode_scalar(constraint.value)
+
+    if value is None:
+        return None
+
+    if constraint.ctype == "hastobe":
+        return f"{key} has to be {value}"
+
+    return f"{key} can't be {value}"
+
+
+def timed_load(s: str, lexer: LexerName, stats: LoadStats) -> Tuple[ReadState, PythonValue]:
+    """
+    Same as `loads(s, stats=stats)`, but the state is returned too
+    """
+    state = TimedReader(stats).read(s, (None, None, None, None), lexer)
+    stats.calls += 1
+
+    with stats.phase("materialize"):
+        value = state.to_dict()
+
+    return state, value
+
+
+def compact(
+    src: Path,
+    dst: Path,
+    *,
+    indent: int | str = 2,
+    lexer: LexerName = "contextual",
+) -> CompactReport:
+    """
+    Writes a document that loads into the same value as `src`, with one statement per value
+    and the constraints that can still reject a value (after the values, so they only apply to what is added later).
+    `dst` can be the same file. Raises ValueError and writes nothing if the result doesn't load into the same value
+    """
+    with open(src, encoding="utf-8") as file:
+        source = file.read()
+
+    source_stats = LoadStats()
+    state, value = timed_load(source, lexer, source_stats)
+
+    encoder = WTFLEncoder(indent=indent, compact=True)
+    statements = [encoder.dumps(value, True)] if value else []
+    constraints = 0
+
+    for constraint in restrictive_constraints(state):
+        statement = encode_constraint(encoder, constraint)
+
+        if statement is not None:
+            statements.append(statement)
+            constraints += 1
+
+    if not statements:
+        # an empty document doesn't parse, `can be` does nothing
+        statements.append("nothing can be")
+
+    compacted = "".join(f"{statement}\n" for statement in statements)
+
+    compacted_stats = LoadStats()
+    _, compacted_value = timed_load(compacted, lexer, compacted_stats)
+
+    if compacted_value != value:
+        raise ValueError(f"{os.fspath(src)} can't be compacted: the result loads into another value")
+
+    replace_file(os.fspath(dst), compacted.encode("utf-8"))
+
+    return CompactReport(
+        len(source.encode("utf-8")),
+        len(compacted.encode("utf-8")),
+        source_stats,
+        compacted_stats,
+        constraints,
+    )
@@ -0,0 +1,248 @@
+from __future__ import annotations
+import hashlib
+import io
+import marshal
+import os
+import struct
+import sys
+from typing import Tuple, Union
+
+from .grammar_cache import replace_file, write_bytes
+from .parser import ParseFunc
+from .reader import PythonValue, loads
+
+Path = Union[str, "os.PathLike[str]"]
+
+MAGIC = b"WTFLC"
+FORMAT_VERSION = 2
+
+# magic, format version, marshal version, source mtime (ns), source size, source sha256, hooks length
+_header = struct.Struct("<5sBHqQ32sH")
+
+
+def compiled_path(path: Path) -> str:
+    """
+    Path of the compiled file for a source file: `config.wtfl` -> `config.wtflc`
+    """
+    path = os.fspath(path)
+    root, ext = os.path.splitext(path)
+    return (root if ext == ".wtfl" else path) + ".wtflc"
+
+
+def hook_name(hook: ParseFunc) -> str | None:
+    """
+    Importable name of a hook, None if it has none that leads back to it
+    (lambdas, nested functions, partials, bound methods)
+    """
+    module: object = getattr(hook, "__module__", None)  # type: ignore[misc]
+    qualname: object = getattr(hook, "__qualname__", None)  # type: ignore[misc]
+
+    if not isinstance(module, str) or not isinstance(qualname, str):
+        return None
+
+    target: object = sys.modules.get(module)
+
+    for part in qualname.split("."):
+        target = getattr(target, part, None)  # type: ignore[misc]
+
+    if target is not hook:
+        return None
+
+    return f"{module}.{qualname}"
+
+
+def hooks_id(*hooks: ParseFunc | None) -> str | None:
+    """
+    Names of the parse hooks, compiled files made with other hooks are treated as stale.
+    None if a hook has no importable name, so compiled files can't be used with it
+    """
+    names = []
+
+    for hook in hooks:
+        if hook is None:
+            names.append("")
+            continue
+
+        name = hook_name(hook)
+
+        if name is None:
+            return None
+
+        names.append(name)
+
+    return ",".join(names)
+
+
+def _source_stamp(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_source(path: str) -> Tuple[Tuple[int, int], bytes]:
+    # stat goes first, so a change made while reading makes the stamp outdated, not the data
+    stamp = _source_stamp(path)
+
+    with open(path, "rb") as file:
+        return stamp, file.read()
+
+
+def _source_text(source: bytes) -> str:
+    """
+    Text of a source file as `load` reads it: in text mode, so newlines are translated
+    """
+    return io.TextIOWrapper(io.BytesIO(source), encoding="utf-8").read()
+
+
+def _read_compiled(cpath: str) -> bytes | None:
+    try:
+        with open(cpath, "rb") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _encode(value: PythonValue, stamp: Tuple[int, int], source: bytes, hooks: str) -> bytes:
+    mtime, size = stamp
+    encoded_hooks = hooks.encode("utf-8")
+
+    header = _header.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        marshal.version,
+        mtime,
+        size,
+        hashlib.sha256(source).digest(),
+        len(encoded_hooks),
+    )
+    return header + encoded_hooks + marshal.dumps(value)
+
+
+def _decode(data: bytes, path: str, hooks: str) -> Tuple[bool, PythonValue, Tuple[int, int] | None]:
+    """
+    Returns (True, value, stamp) if the compiled data is valid for the source and hooks, (False, None, None) otherwise.
+    `stamp` is the new stamp of a source that was touched, but didn't change, None if the stored one is up to date
+    """
+    if len(data) < _header.size:
+        return False, None, None
+
+    header: Tuple[bytes, int, int, int, int, bytes, int] = _header.unpack_from(data)  # type: ignore[misc]
+    magic, format_version, marshal_version, mtime, size, digest, hooks_size = header
+    body = _header.size + hooks_size
+
+    if (magic, format_version, marshal_version) != (MAGIC, FORMAT_VERSION, marshal.version):
+        return False, None, None
+
+    if data[_header.size : body] != hooks.encode("utf-8"):
+        return False, None, None
+
+    stamp: Tuple[int, int] | None = None
+
+    if _source_stamp(path) != (mtime, size):
+        # touched or copied, but possibly not changed
+        stamp, source = _read_source(path)
+
+        if hashlib.sha256(source).digest() != digest:
+            return False, None, None
+
+    value: PythonValue = marshal.loads(data[body:])
+    return True, value, stamp
+
+
+def _restamp(data: bytes, stamp: Tuple[int, int]) -> bytes:
+    """
+    Compiled data with another source stamp
+    """
+    mtime, size = stamp
+    header: Tuple[bytes, int, int, int, int, bytes, int] = _header.unpack_from(data)  # type: ignore[misc]
+    magic, format_version, marshal_version, _, _, digest, hooks_size = header
+
+    return _header.pack(magic, format_version, marshal_version, mtime, size, digest, hooks_size) + data[_header.size :]
+
+
+def compile_file(
+    path: Path,
+    cpath: Path | None = None,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+) -> str:
+    """
+    Loads a source file and writes the result into a compiled file (`compiled_path(path)` by default).
+    Returns the path of the compiled file. Hooks have to be importable by name (not lambdas or nested functions)
+    """
+    path = os.path.abspath(path)
+    cpath = os.path.abspath(cpath if cpath is not None else compiled_path(path))
+    hooks = hooks_id(parse_float, parse_int, parse_roman, parse_numbers)
+
+    if hooks is None:
+        raise ValueError("Parse hooks of a compiled file have to be importable by name")
+
+    stamp, source = _read_source(path)
+
+    value = loads(
+        _source_text(source),
+        parse_float=parse_float,
+        parse_int=parse_int,
+        parse_roman=parse_roman,
+        parse_numbers=parse_numbers,
+    )
+
+    replace_file(cpath, _encode(value, stamp, source, hooks))
+
+    return cpath
+
+
+def load_compiled(
+    path: Path,
+    cpath: Path | None = None,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    write: bool = True,
+) -> PythonValue:
+    """
+    Loads a source file from its compiled file, without parsing.
+    If the compiled file is missing or stale, loads the source and (with `write`) compiles it again.
+    With hooks that aren't importable by name, the compiled file is neither read nor written
+    """
+    path = os.path.abspath(path)
+    cpath = os.path.abspath(cpath if cpath is not None else compiled_path(path))
+    hooks = hooks_id(parse_float, parse_int, parse_roman, parse_numbers)
+
+    data = _read_compiled(cpath) if hooks is not None else None
+
+    if data is not None and hooks is not None:
+        try:
+            valid, value, stamp = _decode(data, path, hooks)
+        except (EOFError, ValueError, TypeError, struct.error):
+            valid = False
+
+        if valid:
+            if stamp is not None and write:
+                # so the source isn't hashed again on every load
+                write_bytes(cpath, _restamp(data, stamp))
+            return value
+
+    stamp, source = _read_source(path)
+
+    value = loads(
+        _source_text(source),
+        parse_float=parse_float,
+        parse_int=parse_int,
+        parse_roman=parse_roman,
+        parse_numbers=parse_numbers,
+    )
+
+    if write and hooks is not None:
+        try:
+            encoded = _encode(value, stamp, source, hooks)
+        except ValueError:
+            pass  # hooks returned values marshal can't store
+        else:
+            write_bytes(cpath, encoded)
+
+    return value
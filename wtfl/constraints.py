@@ -0,0 +1,113 @@
+from __future__ import annotations
+import sys
+from typing import Dict, List, Sequence, Set, Tuple
+
+from .internal_types import Checker, Constraint, Value
+
+Path = Tuple[str, ...]
+
+
+class PathConstraints:
+    """
+    Constraints of a single path.
+
+    Values are first checked against all constraints at once:
+    `has to be` values are compared, `can't be` values are looked up in a set.
+    Only if that fails, constraints are checked one by one to raise the same error
+    the first failing one raises
+    """
+
+    def __init__(self) -> None:
+        self.constraints: List[Constraint] = []
+        self.checkers: List[Checker] = []
+        self.required: List[object] = []
+        self.forbidden: Set[object] = set()
+        self.forbidden_unhashable: List[object] = []
+        self.cant_exist = False
+
+    def add(self, constraint: Constraint) -> None:
+        self.constraints.append(constraint)
+        self.checkers.append(constraint.compile())
+
+        if constraint.ctype == "hastobe":
+            self.required.append(constraint.value)
+
+        elif constraint.ctype == "cantbe":
+            try:
+                self.forbidden.add(constraint.value)
+            except TypeError:
+                self.forbidden_unhashable.append(constraint.value)
+
+        elif constraint.ctype == "cant_exist":
+            self.cant_exist = True
+
+    def allows(self, value: object) -> bool:
+        if self.cant_exist:
+            return False
+
+        for required in self.required:
+            if value != required:
+                return False
+
+        try:
+            if value in self.forbidden:
+                return False
+        except TypeError:
+            return False
+
+        for forbidden in self.forbidden_unhashable:
+            if value == forbidden:
+                return False
+
+        return True
+
+    def check(self, value: object) -> None:
+        if self.allows(value):
+            return
+
+        for checker in self.checkers:
+            checker(value)
+
+
+class ConstraintIndex:
+    """
+    Constraints of a document, grouped by the last part of their path, then by path.
+    An assignment whose last key has no constraints is skipped with a single lookup,
+    without building the path tuple
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[str, Dict[Path, PathConstraints]] = {}
+        # assignments checked against constraints of their path
+        self.checked = 0
+
+    def add(self, constraint: Constraint) -> None:
+        path: Path = tuple(map(sys.intern, constraint.key))
+        by_path = self.names.setdefault(path[-1], {})
+
+        if path not in by_path:
+            by_path[path] = PathConstraints()
+
+        by_path[path].add(constraint)
+
+    def find(self, path: Sequence[str]) -> PathConstraints | None:
+        by_path = self.names.get(path[-1])
+
+        if by_path is None:
+            return None
+
+        return by_path.get(tuple(path))
+
+    def get(self, path: Sequence[str]) -> List[Constraint]:
+        constraints = self.find(path)
+        return constraints.constraints if constraints is not None else []
+
+    def check(self, path: Sequence[str], value: Value) -> None:
+        constraints = self.find(path)
+
+        if constraints is not None:
+            self.checked += 1
+            constraints.check(value)
+
+    def __len__(self) -> int:
+        return sum(map(len, self.names.values()))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import re
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .internal_types import Assign, Constraint, KeyChain, Operation
+from .parser import LexerName, ParseFunc, ParseFuncs
+from .reader import PythonValue, ReadState, Reader, StateValue, Store
+from .scheduler import Schedule
+
+# "weight of apple", or keys from the outermost one: ("apple", "weight")
+PathSpec = Union[str, Sequence[str]]
+# results are keyed by the path string, or by a tuple of keys
+ResultKey = Union[str, Tuple[str, ...]]
+Trie = Dict[str, "TrieNode"]
+
+_of = re.compile(r"\s+of\s+", re.IGNORECASE)
+
+
+class TrieNode:
+    def __init__(self) -> None:
+        self.children: Trie = {}
+        # a requested path ends here, everything below is selected
+        self.selected = False
+
+
+def split_path(path: PathSpec) -> KeyChain:
+    if isinstance(path, str):
+        return _of.split(path.strip())[::-1]
+    return list(path)
+
+
+class Selection:
+    """
+    Requested paths, as a trie of keys
+    """
+
+    def __init__(self, paths: Sequence[KeyChain]) -> None:
+        self.root = TrieNode()
+
+        for path in paths:
+            node = self.root
+            for key in path:
+                node = node.children.setdefault(key, TrieNode())
+            node.selected = True
+
+    def touches(self, path: KeyChain) -> bool:
+        """
+        True if the path is inside a requested subtree or leads to one
+        """
+        node = self.root
+
+        for key in path:
+            if node.selected:
+                return True
+
+            child = node.children.get(key)
+
+            if child is None:
+                return False
+
+            node = child
+
+        return True
+
+
+class ExtractState(ReadState):
+    """
+    ReadState that only assigns paths touching the selection.
+    Other assignments are still checked against constraints
+    """
+
+    def __init__(self, selection: Selection) -> None:
+        super().__init__()
+        self.selection = selection
+
+    def assign(self, op: Assign):
+        if op.key[-1] in self.constraints.names:
+            self.check_constraint(op)
+        if self.selection.touches(op.key):
+            self.assign_path(op.key, op.value)
+
+
+class ExtractReader(Reader):
+    def __init__(self, selection: Selection) -> None:
+        self.selection = selection
+
+    def read_tree(self, tree: List[Operation]) -> ReadState:
+        state = ExtractState(self.selection)
+        # without constraints, statements outside of the selection are dropped before they are unwound
+        drop = not any(isinstance(operation, Constraint) for operation in tree)
+
+        timeline = [
+            []
+            if drop and isinstance(operation, Assign) and not self.selection.touches(operation.key)
+            else self.process_operation(operation)
+            for operation in tree
+        ]
+
+        for operation in Schedule(timeline):
+            self.apply_operation(operation, state)
+
+        return state
+
+
+def resolve(store: Store, path: KeyChain) -> StateValue:
+    """
+    Raises KeyError if there is no value at the path
+    """
+    value: StateValue = store
+
+    for key in path:
+        if not isinstance(value, Store) or key not in value:
+            raise KeyError(key)
+        value = value[key]
+
+    return value
+
+
+def extract(
+    s: str,
+    paths: Sequence[PathSpec],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+) -> Dict[ResultKey, PythonValue]:
+    """
+    Loads only the values at the given paths. Returns {path: value}, paths without a value are left out
+    """
+    chains = [split_path(path) for path in paths]
+    parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+
+    state = ExtractReader(Selection(chains)).read(s, parse_funcs, lexer)
+    result: Dict[ResultKey, PythonValue] = {}
+
+    for path, chain in zip(paths, chains):
+        try:
+            value = resolve(state.keys, chain)
+        except KeyError:
+            continue
+
+        key = path if isinstance(path, str) else tuple(path)
+        result[key] = value.to_python_value() if isinstance(value, Store) else value
+
+    return result
@@ -76,7 +76,9 @@ g._keyword_name = (
     | g.TO
 )
 
-g.file = SomeSeparated(Maybe(g.also), g.statement), Maybe(g.also)
+g.file = g.statements, Maybe(g.also)
+
+g.statements = Maybe(g.statements, Maybe(g.also)), g.statement
 
 g.also = Maybe(g.AND | g.BUT), Literal("also", "i")
 
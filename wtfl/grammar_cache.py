@@ -0,0 +1,115 @@
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from .version import package_version
+
+_GRAMMAR_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar.py")
+
+
+def cache_dir() -> str | None:
+    """
+    Directory used for the compiled grammar cache.
+    Set WTFL_CACHE_DIR to override it, or to an empty string to disable the cache
+    """
+    custom = os.environ.get("WTFL_CACHE_DIR")
+
+    if custom is not None:
+        return custom or None
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "wtfl")
+
+
+def grammar_hash() -> str | None:
+    try:
+        with open(_GRAMMAR_SOURCE, "rb") as file:
+            source = file.read()
+    except OSError:
+        return None
+
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def cache_path(suffix: str) -> str | None:
+    """
+    Returns a path to the cache file with the given suffix,
+    keyed by package version and grammar hash, or None if caching is unavailable
+    """
+    directory = cache_dir()
+    key = grammar_hash()
+
+    if directory is None or key is None:
+        return None
+
+    return os.path.join(directory, package_version(), f"{key}.{suffix}")
+
+
+def read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def write_text(path: str, text: str) -> None:
+    write_bytes(path, text.encode("utf-8"))
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """
+    Writes a file atomically, silently giving up if it can't be written
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replace_file(path, data)
+    except OSError:
+        pass
+
+
+def replace_file(path: str, data: bytes) -> None:
+    """
+    Writes a file atomically, keeping the permissions of the file it replaces. Raises OSError if it can't be written
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_grammar() -> str:
+    """
+    Returns generated grammar text, reusing the cached one if possible.
+    lark_dynamic is only imported on cache miss
+    """
+    path = cache_path("lark")
+
+    if path is not None:
+        cached = read_text(path)
+        if cached:
+            return cached
+
+    from .grammar import g as grammar  # type: ignore
+
+    text: str = grammar.generate()  # type: ignore
+
+    if path is not None:
+        write_text(path, text)
+
+    return text
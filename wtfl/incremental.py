@@ -0,0 +1,216 @@
+from __future__ import annotations
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+from .internal_types import Operation
+from .parallel import boundaries, ends_open, join_parts, parse_chunk
+from .parser import LexerName, ParseFunc, ParseFuncs, parse
+from .reader import PythonValue, ReadState, Reader, StoreMapping
+
+
+# statements of a segment, None if it doesn't parse (the document is probably invalid)
+Segment = Optional[List[Operation]]
+
+
+class IncrementalDocument:
+    """
+    A document that is kept parsed while its text is edited.
+
+    The text is split into segments between top-level statements (see `loads_parallel`),
+    every segment keeps its statements. An edit parses again only the segments it touches
+    (and the following ones, until a segment ends between statements again),
+    the value is the same as `loads` of the whole text.
+
+    Edits don't raise on invalid text, so the text can go through invalid states.
+    Reading the value of an invalid document raises the error of `loads`
+    """
+
+    def __init__(
+        self,
+        text: str = "",
+        *,
+        parse_float: ParseFunc | None = None,
+        parse_int: ParseFunc | None = None,
+        parse_roman: ParseFunc | None = None,
+        parse_numbers: ParseFunc | None = None,
+        lexer: LexerName = "contextual",
+        segment_size: int = 4096,
+    ) -> None:
+        self.parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+        self.lexer: LexerName = lexer
+        self.segment_size = segment_size
+        self.reader = Reader()
+
+        self._text = ""
+        # offsets of segments, and the end of the text
+        self.starts: List[int] = [0, 0]
+        # statements of every segment, the same statements processed for scheduling
+        self.parts: List[Segment] = [[]]
+        self.timelines: List[List[Sequence[Operation]]] = [[]]
+        # True if a segment has no time travel and no constraints
+        self.plain: List[bool] = [True]
+        self._state: ReadState | None = None
+
+        self.rebuild(text)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def split(self, s: str) -> List[int]:
+        return boundaries(s, max(1, len(s) // self.segment_size))
+
+    def parse_region(self, s: str) -> Tuple[List[int], List[Segment]] | None:
+        """
+        Segments of `s` with their statements, None if `s` is not a valid document
+        """
+        cuts = self.split(s)
+        results = [
+            parse_chunk(s[start:end], self.parse_funcs, self.lexer)
+            for start, end in zip(cuts, cuts[1:])
+        ]
+        joined = join_parts(s, cuts, results, self.parse_funcs, self.lexer)
+
+        if joined is None:
+            return None
+
+        starts, parts = joined
+        return starts, list(parts)
+
+    def replace(
+        self,
+        first: int,
+        last: int,
+        offset: int,
+        starts: List[int],
+        parts: List[Segment],
+    ) -> None:
+        """
+        Replaces segments first..last with new ones, `starts` are relative to `offset`
+        and end with the end of the last new segment
+        """
+        delta = offset + starts[-1] - self.starts[last + 1]
+
+        if starts[0] == starts[-1] and last - first + 1 < len(self.parts):
+            # the segments were deleted, don't keep an empty one
+            starts, parts = starts[-1:], []
+
+        self.starts[first : last + 2] = [offset + start for start in starts]
+
+        for i in range(first + len(parts) + 1, len(self.starts)):
+            self.starts[i] += delta
+
+        self.parts[first : last + 1] = parts
+        self.timelines[first : last + 1] = [
+            [] if part is None else [self.reader.process_operation(operation) for operation in part]
+            for part in parts
+        ]
+        self.plain[first : last + 1] = [part is None or self.reader.is_plain(part) for part in parts]
+        self._state = None
+
+    def rebuild(self, text: str) -> None:
+        """
+        Parses the whole text again
+        """
+        self._text = text
+        parsed = self.parse_region(text) or (
+            [0, len(text)],
+            [parse_chunk(text, self.parse_funcs, self.lexer)],
+        )
+        self.replace(0, len(self.parts) - 1, 0, *parsed)
+
+    def edit(self, start: int, end: int, replacement: str) -> None:
+        """
+        Replaces text[start:end] with `replacement`
+        """
+        old = self._text
+
+        if not 0 <= start <= end <= len(old):
+            raise ValueError(f"Invalid edit range {start}:{end} for text of length {len(old)}")
+
+        self._text = text = old[:start] + replacement + old[end:]
+        delta = len(replacement) - (end - start)
+        last_index = len(self.parts) - 1
+
+        # an edit at the start of a segment can join it with the previous one
+        first = min(bisect_right(self.starts, max(start - 1, 0)) - 1, last_index)
+        last = min(bisect_right(self.starts, end) - 1, last_index)
+
+        # segments that didn't parse after previous edits are parsed again too
+        broken = [i for i, part in enumerate(self.parts) if part is None]
+
+        if broken:
+            first = min(first, broken[0])
+            last = max(last, broken[-1])
+
+        while True:
+            offset = self.starts[first]
+            region_end = self.starts[last + 1] + delta
+            parsed = self.parse_region(text[offset:region_end])
+
+            # the next segment is kept only if the region doesn't end with a statement it continues
+            if parsed is not None and (last == last_index or not ends_open(text, offset, region_end)):
+                return self.replace(first, last, offset, *parsed)
+
+            if last == last_index:
+                return self.replace(first, last, offset, [0, region_end - offset], [None])
+
+            last = min(last + (last - first + 1), last_index)
+
+    def set_text(self, text: str) -> None:
+        """
+        Replaces the whole text, parsing again only the changed part between a common prefix and suffix
+        """
+        old = self._text
+        limit = min(len(old), len(text))
+        prefix = 0
+
+        while prefix < limit and old[prefix] == text[prefix]:
+            prefix += 1
+
+        suffix = 0
+        limit -= prefix
+
+        while suffix < limit and old[-1 - suffix] == text[-1 - suffix]:
+            suffix += 1
+
+        self.edit(prefix, len(old) - suffix, text[prefix : len(text) - suffix])
+
+    @property
+    def state(self) -> ReadState:
+        """
+        Raises the error of `loads` if the text is invalid
+        """
+        if None in self.parts:
+            # raises the error of the whole text; if it is valid after all,
+            # an edit changed how the text before it is parsed
+            parse(self._text, self.parse_funcs, self.lexer)
+            self.rebuild(self._text)
+
+        if self._state is None:
+            if all(self.plain):
+                self._state = self.reader.read_tree(
+                    [operation for part in self.parts if part for operation in part]
+                )
+            else:
+                # processed statements of unchanged segments are reused, only scheduling is repeated
+                self._state = self.reader.read_timeline(
+                    [operations for timeline in self.timelines for operations in timeline]
+                )
+
+        return self._state
+
+    def to_python_value(self) -> PythonValue:
+        """
+        Same as `loads(self.text)`
+        """
+        return self.state.to_dict()
+
+    def view(self) -> StoreMapping:
+        """
+        Same as `loads(self.text, lazy=True)`
+        """
+        return StoreMapping(self.state.keys)
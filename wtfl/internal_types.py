@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Protocol, TypeVar, Union, List
+from typing import Callable, Protocol, TypeVar, Union, List
 from typing_extensions import Literal
 import random
 
@@ -30,26 +30,51 @@ class Constraint(Operation):
         self.key = tuple(key)
         self.value = value
 
-    def key_repr(self):
+    def key_repr(self) -> str:
         return " of ".join(map(repr, reversed(self.key)))
 
     def __repr__(self):
         return f"{self.key} {self.ctype}, {self.value}"
 
     def check(self, value):
+        self.compile()(value)
+
+    def compile(self) -> Checker:
+        """
+        Returns a function that checks a value against this constraint
+        """
+        expected = self.value
+
         if self.ctype == "hastobe":
-            if value != self.value:
-                raise ValueError(
-                    f"{self.key_repr()} has to be {self.value}, not {value}"
-                ) from None
-            return
+
+            def has_to_be(value: object) -> None:
+                if value != expected:
+                    raise ValueError(
+                        f"{self.key_repr()} has to be {expected}, not {value}"
+                    ) from None
+
+            return has_to_be
 
         if self.ctype == "cantbe":
-            if value == self.value:
-                raise ValueError(f"{self.key_repr()} cannot be {self.value}")
+
+            def cant_be(value: object) -> None:
+                if value == expected:
+                    raise ValueError(f"{self.key_repr()} cannot be {expected}")
+
+            return cant_be
 
         if self.ctype == "cant_exist":
-            raise ValueError(f"{self.key_repr()} cannot exist")
+
+            def cant_exist(value: object) -> None:
+                raise ValueError(f"{self.key_repr()} cannot exist")
+
+            return cant_exist
+
+        return _allow
+
+
+def _allow(value: object) -> None:
+    pass
 
 
 class Assign(Operation):
@@ -70,6 +95,15 @@ class Assign(Operation):
 
         return self.value.flatten_paths(prefix + self.key)
 
+    def count(self) -> int:
+        """
+        Number of assignments `unwind` returns, without building them
+        """
+        if isinstance(self.value, Object) and self.value.pairs:
+            return sum(pair.count() for pair in self.value.pairs)
+
+        return 1
+
     def __repr__(self):
         return f"{self.key} = {self.value}"
 
@@ -107,5 +141,7 @@ class SupportsWrite(Protocol[_T_contra]):
 
 Value = Union[str, float, bool, None, Object]
 
+Checker = Callable[[object], None]
+
 
 ConstraintType = Union[Literal["hastobe"], Literal["cantbe"], Literal["cant_exist"]]
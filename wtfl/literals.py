@@ -0,0 +1,97 @@
+from __future__ import annotations
+import codecs
+import sys
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from .reader import PythonValue
+
+# prefix letter -> base of integer literals (0b..., 0o..., 0d..., 0z..., 0x..., 0v...)
+number_bases: Dict[str, int] = {
+    "b": 2,
+    "o": 8,
+    "d": 10,
+    "z": 12,
+    "x": 16,
+    "v": 20,
+}
+
+
+def make_roman_digit(i: int) -> int:
+    base: int = (i % 2) * 4 + 1
+    exponent: int = 10 ** (i // 2)
+
+    return base * exponent
+
+
+roman_digits: Dict[str, int] = {k: make_roman_digit(i) for i, k in enumerate("IVXLCDM")}
+
+# keys of the first array items, "0", "1", ...
+_index_keys: List[str] = [sys.intern(str(i)) for i in range(1024)]
+
+
+def decode_string(literal: str) -> str:
+    """
+    Value of a string literal, with quotes. Literals without escapes are not decoded
+    """
+    body = literal[1:-1]
+
+    if "\\" not in body:
+        if body.isascii():
+            return body
+        # what unicode_escape does to a str without escapes
+        return body.encode("utf-8").decode("latin-1")
+
+    return codecs.unicode_escape_decode(body)[0]
+
+
+def key_name(token: object) -> str:
+    """
+    Interned key, so repeated keys share one string in every Store
+    """
+    return sys.intern(str(token))
+
+
+def index_key(index: int) -> str:
+    """
+    Key of an array item, shared between arrays
+    """
+    if index < len(_index_keys):
+        return _index_keys[index]
+
+    return sys.intern(str(index))
+
+
+def parse_float(s: str) -> PythonValue:
+    return float(s)
+
+
+def parse_int(s: str) -> PythonValue:
+    return int(s)
+
+
+def parse_roman(s: str) -> PythonValue:
+    num = s[2:].upper()
+    result = 0
+    current = [0, 0]
+    for digit in num:
+        digit_value = roman_digits[digit]
+        if current[0] == digit_value:
+            current[1] += 1
+        else:
+            part_value = current[0] * current[1]
+            if digit_value > part_value:
+                result -= part_value
+            else:
+                result += part_value
+            current = [digit_value, 1]
+    return result + current[0] * current[1]
+
+
+def parse_numbers(s: str) -> PythonValue:
+    prefix = s[1].lower()
+
+    if prefix == "u":
+        return len(s) - 2
+
+    return int(s[2:], number_bases[prefix])
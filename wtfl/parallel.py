@@ -0,0 +1,194 @@
+from __future__ import annotations
+import os
+import re
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence, Tuple
+
+from .internal_types import ARRAY_KEY, Assign, Constraint, Object, Operation
+from .parser import LexerName, ParseFunc, ParseFuncs, parse
+from .reader import PythonValue, Reader
+
+ChunkResult = Optional[List[Operation]]
+
+# a newline before a line that starts with something, but not with the end of an object or `also`,
+# which can't start a document
+_line_start = re.compile(
+    r"\n(?=[^\s])(?!(?:that|this|these|those|there|also|and\s+also|but\s+also)\b)",
+    re.IGNORECASE,
+)
+# `key can be` and `key can't be` take an optional value, so at the end of text (before whitespace and comments)
+# they are still open: parsed together with the next statement, its first token is their value
+_open_end = re.compile(
+    r"\b(?:can|cannot|can't)(?:\s*'s|\s*'re|\s+(?:is|are|do|does|be)\b)(?:\s|\.\.\.[^\n]*)*\Z",
+    re.IGNORECASE,
+)
+
+
+def ends_open(s: str, start: int, end: int) -> bool:
+    """
+    True if s[start:end] ends with a statement the next one can continue, so it can't be cut at `end`
+    """
+    return _open_end.search(s, start, end) is not None
+
+
+def boundaries(s: str, parts: int) -> List[int]:
+    """
+    Offsets to cut the document at: line starts about len(s) / parts characters apart,
+    including 0 and len(s). Cuts are only guesses, see `parse_parallel`
+    """
+    size = max(1, len(s) // parts)
+    result = [0]
+    position = size
+
+    while position < len(s):
+        match = _line_start.search(s, position)
+
+        if match is None:
+            break
+
+        if ends_open(s, result[-1], match.end()):
+            position = match.end()
+            continue
+
+        result.append(match.end())
+        position = match.end() + size
+
+    result.append(len(s))
+    return result
+
+
+def parse_chunk(
+    chunk: str,
+    parse_funcs: ParseFuncs,
+    lexer: LexerName,
+    array_key: str = ARRAY_KEY,
+) -> ChunkResult:
+    """
+    Statements of a part of a document, None if it is not a complete document itself.
+    `array_key` is ARRAY_KEY of the process the statements are sent to
+    """
+    try:
+        tree = parse(chunk, parse_funcs, lexer)
+    except ValueError:
+        return None
+
+    if array_key != ARRAY_KEY:
+        # a worker that wasn't forked (spawn, forkserver) generated its own key
+        rekey_arrays(tree, array_key)
+
+    return tree
+
+
+def rekey_arrays(operations: Sequence[Operation], array_key: str) -> None:
+    """
+    Replaces the array markers of this process in statements with `array_key`
+    """
+    for operation in operations:
+        if isinstance(operation, (Assign, Constraint)) and isinstance(operation.value, Object):
+            pairs = operation.value.pairs
+
+            if pairs and pairs[0].key == [ARRAY_KEY]:
+                pairs[0].key = [array_key]
+
+            rekey_arrays(pairs, array_key)
+
+
+def join_parts(
+    s: str,
+    cuts: List[int],
+    results: List[ChunkResult],
+    parse_funcs: ParseFuncs,
+    lexer: LexerName,
+) -> Tuple[List[int], List[List[Operation]]] | None:
+    """
+    Joins parts of a document cut at `cuts` (`results` are the parts parsed on their own).
+
+    A part is used only if it starts where a previous part ended and parses on its own,
+    which means it ends between top-level statements too.
+    A part that doesn't parse (it was cut inside a statement or an object) is parsed
+    again together with the next one, then the next three, and so on.
+
+    Returns the starts of the used parts (and the end of the last one) with their statements,
+    or None if the text is not a valid document
+    """
+    starts: List[int] = []
+    parts: List[List[Operation]] = []
+    i = 0
+
+    while i < len(results):
+        result = results[i]
+        end = i + 1
+        span = 1
+
+        while result is None and end < len(results):
+            span *= 2
+            end = min(i + span, len(results))
+            result = parse_chunk(s[cuts[i] : cuts[end]], parse_funcs, lexer)
+
+        if result is None:
+            return None
+
+        starts.append(cuts[i])
+        parts.append(result)
+        i = end
+
+    starts.append(cuts[-1])
+    return starts, parts
+
+
+def parse_parallel(
+    s: str,
+    parse_funcs: ParseFuncs,
+    lexer: LexerName,
+    executor: Executor,
+    parts: int,
+) -> List[Operation]:
+    """
+    Parses parts of a document in the executor and joins their statements (see `join_parts`).
+    Time travel offsets are relative, so joined statement lists keep their meaning
+    """
+    cuts = boundaries(s, parts)
+    futures = [
+        executor.submit(parse_chunk, s[start:end], parse_funcs, lexer, ARRAY_KEY)
+        for start, end in zip(cuts, cuts[1:])
+    ]
+    joined = join_parts(s, cuts, [future.result() for future in futures], parse_funcs, lexer)
+
+    if joined is None:
+        # the document is invalid, get the same error as a serial parse would raise
+        return parse(s, parse_funcs, lexer)
+
+    return [operation for part in joined[1] for operation in part]
+
+
+def loads_parallel(
+    s: str,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    workers: int | None = None,
+    executor: Executor | None = None,
+    parts: int | None = None,
+) -> PythonValue:
+    """
+    Same as `loads`, but parts of the document are parsed in a process pool.
+    Pass `executor` to reuse a pool, otherwise one with `workers` processes is started for the call.
+    Parse hooks have to be picklable
+    """
+    parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+    workers = workers or os.cpu_count() or 1
+    parts = parts or workers * 4
+
+    if executor is None:
+        # imported on use, it imports multiprocessing, which is slow
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            tree = parse_parallel(s, parse_funcs, lexer, pool, parts)
+    else:
+        tree = parse_parallel(s, parse_funcs, lexer, executor, parts)
+
+    return Reader().read_tree(tree).to_dict()
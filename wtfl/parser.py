@@ -1,154 +1,321 @@
 from __future__ import annotations
 import typing
-import codecs
-from typing import Callable, List, Dict, Optional, Tuple
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, Type, Union
+from typing_extensions import Literal
 
 from lark import Lark, Transformer
 from lark.exceptions import UnexpectedCharacters, UnexpectedToken
-
-from .internal_types import ARRAY_KEY, Also, Constraint, Object, Assign, Operation
-from .grammar import g as grammar  # type: ignore
+from lark.lexer import Lexer, LexerThread
+
+from .internal_types import (
+    ARRAY_KEY,
+    Also,
+    Constraint,
+    Object,
+    Assign,
+    Operation,
+    SupportsRead,
+)
+from .grammar_cache import cache_path, load_grammar
+from .literals import (
+    decode_string,
+    index_key,
+    key_name,
+    parse_float,
+    parse_int,
+    parse_numbers,
+    parse_roman,
+)
+from .scanner import WTFLScanner
+from .stats import LoadStats
 
 
-def parse(s: str, parse_funcs: ParseFuncs) -> List[Operation]:
-    (
-        parse_float_custom,
-        parse_int_custom,
-        parse_roman_custom,
-        parse_numbers_custom,
-    ) = parse_funcs
+def parse(
+    s: str,
+    parse_funcs: ParseFuncs,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+) -> List[Operation]:
+    config = TransformConfig(*parse_funcs)
+    token = _config.set(config)
 
-    if parse_float_custom:
-        WTFLTransformer.parse_float = parse_float_custom
+    try:
+        if stats is None:
+            return typing.cast(List[Operation], get_parser(lexer).parse(s))
 
-    if parse_int_custom:
-        WTFLTransformer.parse_int = parse_int_custom
+        config.stats = stats
+        parser = get_parser(lexer, timed=True)
+        transform_time = stats.times["transform"]
 
-    if parse_roman_custom:
-        WTFLTransformer.parse_roman = parse_roman_custom
+        with stats.phase("parse"):
+            tree = typing.cast(List[Operation], parser.parse(s))
 
-    if parse_numbers_custom:
-        WTFLTransformer.parse_numbers = parse_numbers_custom
-
-    try:
-        return typing.cast(List[Operation], _parser.parse(s))
+        # parse time includes the callbacks, which are already counted as transform time
+        stats.times["parse"] -= stats.times["transform"] - transform_time
+        return tree
 
     except UnexpectedCharacters as e:  # type: ignore[misc]
-        raise ValueError(
-            f"Unexpected characters at line {e.line} column {e.column}: {e.char}\n{e.get_context(s)}"  # type: ignore[misc]
-        ) from None
+        raise _unexpected_characters(e, s) from None  # type: ignore[misc]
 
     except UnexpectedToken as e:  # type: ignore[misc]
-        raise ValueError(
-            f"Unexpected token at line {e.line} column {e.column}: {e.token}\n{e.get_context(s, 100)}"  # type: ignore[misc]
-        ) from None
+        raise _unexpected_token(e, s) from None  # type: ignore[misc]
 
     finally:
-        WTFLTransformer.parse_float = parse_float
-        WTFLTransformer.parse_int = parse_int
-        WTFLTransformer.parse_roman = parse_roman
-        WTFLTransformer.parse_numbers = parse_numbers
-
+        _config.reset(token)
 
-def _unpack(_: object, tokens: List[object]) -> object:
-    return tokens[0]
 
+class ParseError(ValueError):
+    """
+    Error of a document that doesn't parse, with the position of the problem (1-based)
+    """
 
-def make_roman_digit(i: int) -> int:
-    base: int = (i % 2) * 4 + 1
-    exponent: int = 10 ** (i // 2)
+    def __init__(self, reason: str, line: int, column: int, text: str, context: str) -> None:
+        super().__init__(f"{reason} at line {line} column {column}: {text}\n{context}")
+        self.reason = reason
+        self.line = line
+        self.column = column
+        # the unexpected token or characters
+        self.text = text
+        self.context = context
 
-    return base * exponent
+    def __reduce__(self) -> Tuple[type, Tuple[str, int, int, str, str]]:
+        return ParseError, (self.reason, self.line, self.column, self.text, self.context)
 
 
-roman_digits: Dict[str, int] = {k: make_roman_digit(i) for i, k in enumerate("IVXLCDM")}
+def _unexpected_characters(e, s):
+    return ParseError("Unexpected characters", e.line, e.column, e.char, e.get_context(s))
 
 
-def parse_float(s: str) -> PythonValue:
-    return float(s)
+def _unexpected_token(e, s):
+    return ParseError("Unexpected token", e.line, e.column, str(e.token), e.get_context(s, 100))
 
 
-def parse_int(s: str) -> PythonValue:
-    return int(s)
+def parse_located(
+    s: str,
+    parse_funcs: ParseFuncs,
+    lexer: LexerName = "contextual",
+) -> Tuple[List[Operation], List[Tuple[int, int]]]:
+    """
+    Same as `parse`, but also returns the line and column where every top-level statement starts
+    """
+    parser = get_parser(lexer)
+    interactive = parser.parse_interactive(start="file")  # type: ignore[misc]
 
+    statements: List[Operation] = []
+    positions: List[Tuple[int, int]] = []
+    config = TransformConfig(*parse_funcs)
+    config.sink = statements
 
-def parse_roman(s: str) -> PythonValue:
-    num = s[2:].upper()
-    result = 0
-    current = [0, 0]
-    for digit in num:
-        digit_value = roman_digits[digit]
-        if current[0] == digit_value:
-            current[1] += 1
+    token = _config.set(config)
+    try:
+        _feed_located(interactive, s, statements, positions)  # type: ignore[misc]
+    except UnexpectedCharacters as e:  # type: ignore[misc]
+        raise _unexpected_characters(e, s) from None  # type: ignore[misc]
+    except UnexpectedToken as e:  # type: ignore[misc]
+        raise _unexpected_token(e, s) from None  # type: ignore[misc]
+    finally:
+        _config.reset(token)
+
+    return statements, positions
+
+
+def _feed_located(interactive, s, statements, positions):
+    """
+    Feeds the tokens of `s` one by one. A statement is complete when the token after it is fed,
+    that token starts the next statement (unless it is `also`)
+    """
+    thread = LexerThread.from_text(interactive.lexer_thread.lexer, s)
+    start = None
+    previous = None
+
+    for token in thread.lex(interactive.parser_state):
+        if start is None:
+            start = token
+        elif token.lower() == "also" and start is previous:
+            # `and also` / `but also` between statements
+            start = None
+
+        previous = token
+
+        count = len(statements)
+        interactive.feed_token(token)
+
+        if len(statements) > count:
+            positions.append((start.line, start.column))
+            start = None if token.lower() == "also" else token
+
+    interactive.feed_eof()
+
+    if len(statements) > len(positions):
+        positions.append((start.line, start.column) if start is not None else (1, 1))
+
+
+def parse_stream(
+    file: SupportsRead[str],
+    parse_funcs: ParseFuncs,
+    lexer: LexerName = "contextual",
+    chunk_size: int = 1 << 16,
+) -> Iterator[Operation]:
+    """
+    Parses a file chunk by chunk, yielding top-level statements as soon as they are complete.
+    Chunks are cut after a newline, so only a multiline string can span them,
+    in which case the string is carried over to the next chunk
+    """
+    parser = get_parser(lexer)
+    interactive = parser.parse_interactive(start="file")  # type: ignore[misc]
+
+    statements: List[Operation] = []
+    config = TransformConfig(*parse_funcs)
+    config.sink = statements
+
+    pending = ""
+    line = 1
+    column = 1
+    eof = False
+
+    while not eof:
+        data = file.read(chunk_size)
+        eof = not data
+        text = pending + data
+        cut = len(text) if eof else text.rfind("\n") + 1
+
+        if not cut and not eof:
+            pending = text
+            continue
+
+        chunk = text[:cut]
+        pending = text[cut:]
+
+        token = _config.set(config)
+        try:
+            carry: Tuple[int, int, int] | None = _feed_chunk(  # type: ignore[misc]
+                interactive, chunk, line, column, eof
+            )
+            if eof:
+                interactive.feed_eof()  # type: ignore[misc]
+
+        except UnexpectedCharacters as e:  # type: ignore[misc]
+            raise _unexpected_characters(e, chunk) from None  # type: ignore[misc]
+
+        except UnexpectedToken as e:  # type: ignore[misc]
+            raise _unexpected_token(e, chunk) from None  # type: ignore[misc]
+
+        finally:
+            _config.reset(token)
+
+        if carry is None:
+            line += chunk.count("\n")
+            column = 1 if chunk.endswith("\n") else column
         else:
-            part_value = current[0] * current[1]
-            if digit_value > part_value:
-                result -= part_value
-            else:
-                result += part_value
-            current = [digit_value, 1]
-    return result + current[0] * current[1]
+            offset, line, column = carry
+            pending = chunk[offset:] + pending
+
+        yield from statements
+        statements.clear()
+
+
+def _feed_chunk(interactive, chunk, line, column, eof):
+    """
+    Lexes a chunk in the context of the interactive parser and feeds the tokens.
+    Returns where to resume if the chunk ends inside a string literal
+    """
+    thread = LexerThread.from_text(interactive.lexer_thread.lexer, chunk)
+    line_ctr = thread.state.line_ctr
+    line_ctr.line = line
+    line_ctr.line_start_pos = 1 - column
+    line_ctr.column = column
+
+    try:
+        for token in thread.lex(interactive.parser_state):
+            interactive.feed_token(token)
+    except UnexpectedCharacters as e:
+        if eof or chunk[e.pos_in_stream] != '"':
+            raise
+        return e.pos_in_stream, e.line, e.column
 
+    return None
 
-def parse_numbers(s: str) -> PythonValue:
-    if s[1] == "u":
-        return len(s) - 2
 
-    bases = {
-        "b": 2,
-        "o": 8,
-        "d": 10,
-        "z": 12,
-        "v": 20,
-    }
-    return int(s[2:], bases[s[1]])
+def _unpack(_: object, tokens: List[object]) -> object:
+    return tokens[0]
+
+
+class TransformConfig:
+    """
+    Number parsing hooks of a single parse call.
+    Missing hooks fall back to the default ones
+    """
+
+    def __init__(
+        self,
+        parse_float_custom: ParseFunc | None = None,
+        parse_int_custom: ParseFunc | None = None,
+        parse_roman_custom: ParseFunc | None = None,
+        parse_numbers_custom: ParseFunc | None = None,
+    ) -> None:
+        self.parse_float: ParseFunc = parse_float_custom or parse_float
+        self.parse_int: ParseFunc = parse_int_custom or parse_int
+        self.parse_roman: ParseFunc = parse_roman_custom or parse_roman
+        self.parse_numbers: ParseFunc = parse_numbers_custom or parse_numbers
+        # when set, top-level statements are passed here instead of being collected
+        self.sink: List[Operation] | None = None
+        # when set, the timed parser adds callback time here
+        self.stats: LoadStats | None = None
+
+
+# the shared parser calls one transformer instance from every thread,
+# so the hooks of the current call live in a context variable instead of the class
+_config: ContextVar[TransformConfig] = ContextVar(
+    "wtfl_transform_config", default=TransformConfig()
+)
 
 
 class WTFLTransformer(Transformer):
     value = _unpack
     number = _unpack
-    parse_float: ParseFunc = parse_float
-    parse_int: ParseFunc = parse_int
-    parse_roman: ParseFunc = parse_roman
-    parse_numbers: ParseFunc = parse_numbers
 
     def float(self, tokens):
         s = tokens[0]
 
-        if "." in s:
-            return WTFLTransformer.parse_float(s)
-        return WTFLTransformer.parse_int(s)
+        if "." in s or "e" in s or "E" in s:
+            return _config.get().parse_float(s)
+        return _config.get().parse_int(s)
 
     def integer(self, tokens):
-        return WTFLTransformer.parse_int(tokens[0])
+        return _config.get().parse_int(tokens[0])
 
     def negative(self, tokens):
         return -tokens[1]
 
     def roman(self, tokens):
-        return WTFLTransformer.parse_roman(tokens[0])
+        return _config.get().parse_roman(tokens[0])
 
     def hexadecimal(self, tokens):
-        return WTFLTransformer.parse_numbers(tokens[0])
+        return _config.get().parse_numbers(tokens[0])
 
     def octal(self, tokens):
-        return WTFLTransformer.parse_numbers(tokens[0])
+        return _config.get().parse_numbers(tokens[0])
 
     def binary(self, tokens):
-        return WTFLTransformer.parse_numbers(tokens[0])
+        return _config.get().parse_numbers(tokens[0])
+
+    def decimal(self, tokens):
+        return _config.get().parse_numbers(tokens[0])
 
     def duodecimal(self, tokens):
-        return WTFLTransformer.parse_numbers(tokens[0])
+        return _config.get().parse_numbers(tokens[0])
 
     def vigesimal(self, tokens):
-        return WTFLTransformer.parse_numbers(tokens[0])
+        return _config.get().parse_numbers(tokens[0])
 
     def unary_int(self, tokens):
-        return WTFLTransformer.parse_numbers(tokens[0])
+        return _config.get().parse_numbers(tokens[0])
 
     def string(self, tokens):
-        decoder = codecs.getdecoder("unicode_escape")
-        return decoder(tokens[0][1:-1])[0]
+        return decode_string(tokens[0])
 
     def object(self, tokens):
         [_, *pairs, _] = tokens
@@ -157,7 +324,7 @@ class WTFLTransformer(Transformer):
     def array(self, tokens):
         [_, *values, _] = tokens
 
-        pairs = [Assign([str(i)], value) for i, value in enumerate(values)]
+        pairs = [Assign([index_key(i)], value) for i, value in enumerate(values)]
         pairs.insert(0, Assign([ARRAY_KEY], True))
 
         return Object(pairs)
@@ -166,7 +333,7 @@ class WTFLTransformer(Transformer):
         return self.array([None, None])
 
     def base_key(self, tokens):
-        return str(tokens[-1])
+        return key_name(tokens[-1])
 
     def key(self, tokens):
         return tokens[::-2]
@@ -200,8 +367,23 @@ class WTFLTransformer(Transformer):
         [key, *_, value] = tokens
         return Constraint("hastobe", key, value)
 
-    def file(self, statements):
-        return [s for s in statements if not isinstance(s, Also)]
+    def statements(self, tokens):
+        statement = tokens[-1]
+        sink = _config.get().sink
+
+        if sink is not None:
+            sink.append(statement)
+            return None
+
+        if len(tokens) == 1:
+            return [statement]
+
+        statements = tokens[0]
+        statements.append(statement)
+        return statements
+
+    def file(self, tokens):
+        return tokens[0]
 
     def past_travel(self, tokens):
         return -tokens[-1]
@@ -230,25 +412,75 @@ class WTFLTransformer(Transformer):
         return None
 
 
-class TransformConfig:
-    parse_float = float
-    parse_int = int
-    parse_roman = WTFLTransformer.parse_roman
-
-
 transformer = WTFLTransformer()
 
 
-_parser = Lark(
-    grammar=grammar.generate(),  # type: ignore
-    parser="lalr",
-    start="file",
-    transformer=transformer,
-)
+def _timed(callback):
+    def timed(tokens):
+        start = perf_counter()
+        try:
+            return callback(tokens)
+        finally:
+            stats = _config.get().stats
+            if stats is not None:
+                stats.times["transform"] += perf_counter() - start
+
+    return timed
+
+
+class TimedTransformer(WTFLTransformer):
+    """
+    WTFLTransformer that adds the time of its callbacks to the stats of the current call.
+    Used by a separate parser, so loads without stats don't pay for it
+    """
+
+    def __init__(self):
+        super().__init__()
+        # callbacks of a plain instance, so callbacks calling each other are timed once
+        plain = WTFLTransformer()
+
+        for name, value in vars(WTFLTransformer).items():
+            if not name.startswith("_") and callable(value):
+                setattr(self, name, _timed(getattr(plain, name)))
+
+
+_lexers: Dict[LexerName, Union[str, Type[Lexer]]] = {
+    "contextual": "contextual",
+    "wtfl": WTFLScanner,
+}
+_parsers: Dict[Tuple[LexerName, bool], Lark] = {}
+_parser_lock = threading.Lock()
+
+
+def get_parser(lexer: LexerName = "contextual", timed: bool = False) -> Lark:
+    """
+    Returns the shared parser for the lexer backend, building it on first use.
+    With `timed`, returns a parser with TimedTransformer instead.
+    Grammar text and LALR tables are cached on disk (see grammar_cache)
+    """
+    key = (lexer, timed)
+    parser = _parsers.get(key)
+
+    if parser is not None:
+        return parser
+
+    with _parser_lock:
+        if key not in _parsers:
+            _parsers[key] = Lark(
+                grammar=load_grammar(),
+                parser="lalr",
+                lexer=_lexers[lexer],
+                start="file",
+                transformer=TimedTransformer() if timed else transformer,
+                cache=cache_path(f"{lexer}.tables") or False,
+            )
+
+    return _parsers[key]
 
 from .reader import PythonValue
 
 ParseFunc = Callable[[str], PythonValue]
+LexerName = Literal["contextual", "wtfl"]
 ParseFuncs = Tuple[
     Optional[ParseFunc],
     Optional[ParseFunc],
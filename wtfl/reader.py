@@ -1,6 +1,8 @@
 from __future__ import annotations
 from logging import warn
-from typing import List, Sequence, Union, Dict, Tuple
+import heapq
+from typing import Iterable, Iterator, List, Mapping, Sequence, Union, Dict, Tuple, overload
+from typing_extensions import Literal
 from .internal_types import (
     ARRAY_KEY,
     Constraint,
@@ -16,20 +18,68 @@ PythonValue = Union[
     str, float, bool, None, Dict[str, "PythonValue"], List["PythonValue"]
 ]
 
-from .parser import ParseFunc, ParseFuncs, parse, Assign
+from .parser import LexerName, ParseFunc, ParseFuncs, parse, parse_stream, Assign
+from .constraints import ConstraintIndex
+from .scheduler import Schedule
+from .stats import LoadStats
+
+
+def array_index(key: str) -> int | None:
+    """
+    Index for keys written as canonical integers ("0", "12", "-3"), None for others
+    """
+    if not key.isascii():
+        return None
+
+    if key.isdigit():
+        if key[0] != "0" or len(key) == 1:
+            return int(key)
+        return None
+
+    if key[:1] == "-" and key[1:].isdigit() and key[1] != "0":
+        return int(key)
+
+    return None
+
+
+def _pair_index(pair: Tuple[int, StateValue]) -> int:
+    return pair[0]
 
 
 class Store:
     def __init__(self) -> None:
+        # while every key is a canonical integer, values are kept by index,
+        # otherwise (and after the store becomes an object) by string key
+        self.items: Dict[int, StateValue] | None = {}
         self.keys: Dict[str, StateValue] = {}
         self.is_array: bool = False
         self.can_be_array: bool = True
+        # indices were added in increasing order
+        self.ordered: bool = True
+        self.last_index: int = -1
 
     def add_key(self, key: str, value: StateValue):
         if key == ARRAY_KEY and self.can_be_array:
             self.is_array = True
             return
 
+        items = self.items
+
+        if items is not None:
+            index = array_index(key)
+
+            if index is not None:
+                if index > self.last_index or not items:
+                    self.last_index = index
+                elif index not in items:
+                    self.ordered = False
+
+                items[index] = value
+                return
+
+            self.keys = {str(index): value for index, value in items.items()}
+            self.items = None
+
         if self.can_be_array:
             if key.lstrip("-").isnumeric():
                 try:
@@ -43,31 +93,62 @@ class Store:
         self.is_array = False
         self.keys[key] = value
 
+    def values(self) -> Iterable[StateValue]:
+        if self.items is not None:
+            return self.items.values()
+        return self.keys.values()
+
+    def array_items(self) -> List[Tuple[int, StateValue]]:
+        """
+        Array items with non-negative indices, in index order
+        """
+        items = self.items
+
+        if items is None:
+            pairs = [(int(key), value) for key, value in self.keys.items()]
+            pairs.sort(key=_pair_index)
+        elif self.ordered:
+            pairs = list(items.items())
+        else:
+            pairs = sorted(items.items(), key=_pair_index)
+
+        if pairs and pairs[0][0] < 0:
+            pairs = [pair for pair in pairs if pair[0] >= 0]
+
+        return pairs
+
+    def array_values(self) -> List[StateValue]:
+        """
+        Values of an array, in index order, with negative indices dropped and holes closed
+        """
+        pairs = self.array_items()
+
+        if self.items is not None:
+            # indices are unique, so they go 0, 1, 2... unless there are holes
+            holes = bool(pairs) and pairs[-1][0] != len(pairs) - 1
+        else:
+            holes = any(index != i for i, (index, _) in enumerate(pairs))
+
+        if holes:
+            warn("Warning: array holes are removed. Check your array indices")
+
+        return [value for _, value in pairs]
+
     def to_python_value(self) -> PythonValue:
         if self.is_array:
-            result_list: List[PythonValue] = []
-            last_index = -1
-            warned_about_holes = False
-
-            for key, value in sorted(self.keys.items()):
-                index = int(key)
-                if index < 0:
-                    continue
-                if (index - last_index - 1) and not warned_about_holes:
-                    warn("Warning: array holes are removed. Check your array indices")
-                    warned_about_holes = True
-
-                if isinstance(value, Store):
-                    result_list.append(value.to_python_value())
-                else:
-                    result_list.append(value)
-
-                last_index = index
-            return result_list
+            return [
+                value.to_python_value() if isinstance(value, Store) else value
+                for value in self.array_values()
+            ]
 
         result_dict: Dict[str, PythonValue] = {}
 
-        for key, value in self.keys.items():
+        if self.items is not None:
+            entries: Iterable[Tuple[object, StateValue]] = self.items.items()
+        else:
+            entries = self.keys.items()
+
+        for key, value in entries:
             if isinstance(value, Store):
                 py_value = value.to_python_value()
             else:
@@ -78,18 +159,145 @@ class Store:
         return result_dict
 
     def __contains__(self, key):
+        if self.items is not None:
+            index = array_index(key)
+            return index is not None and index in self.items
         return key in self.keys
 
-    def __getitem__(self, key: str):
+    def __getitem__(self, key: str) -> StateValue:
+        if self.items is not None:
+            index = array_index(key)
+            if index is None:
+                raise KeyError(key)
+            return self.items[index]
         return self.keys[key]
 
     def __setitem__(self, key: str, value: StateValue):
         self.add_key(key, value)
 
 
+LazyValue = Union[str, float, bool, None, "StoreMapping", "StoreSequence"]
+
+
+def view(value: StateValue) -> LazyValue:
+    """
+    Read-only view of a Store (StoreSequence for arrays, StoreMapping for objects), other values as is
+    """
+    if not isinstance(value, Store):
+        return value
+    if value.is_array:
+        return StoreSequence(value)
+    return StoreMapping(value)
+
+
+class StoreMapping(Mapping[str, LazyValue]):
+    """
+    Read-only view of an object. Nested objects and arrays are converted when accessed
+    """
+
+    def __init__(self, store: Store) -> None:
+        self.store = store
+        self.children: Dict[str, LazyValue] = {}
+
+    def __getitem__(self, key: str) -> LazyValue:
+        if key in self.children:
+            return self.children[key]
+
+        if not isinstance(key, str):
+            raise KeyError(key)
+
+        value = self.store[key]
+
+        if not isinstance(value, Store):
+            return value
+
+        child = self.children[key] = view(value)
+        return child
+
+    def __iter__(self) -> Iterator[str]:
+        if self.store.items is not None:
+            return map(str, self.store.items)
+        return iter(self.store.keys)
+
+    def __len__(self) -> int:
+        if self.store.items is not None:
+            return len(self.store.items)
+        return len(self.store.keys)
+
+    def to_python_value(self) -> PythonValue:
+        return self.store.to_python_value()
+
+    def __repr__(self) -> str:
+        return f"StoreMapping({self.to_python_value()!r})"
+
+
+class StoreSequence(Sequence[LazyValue]):
+    """
+    Read-only view of an array, with the same order and hole handling as Store.to_python_value.
+    Nested objects and arrays are converted when accessed
+    """
+
+    def __init__(self, store: Store) -> None:
+        self.store = store
+        self.values: List[StateValue] = store.array_values()
+        self.children: Dict[int, LazyValue] = {}
+
+    def item(self, index: int) -> LazyValue:
+        if index < 0:
+            index += len(self.values)
+
+        if not 0 <= index < len(self.values):
+            raise IndexError("array index out of range")
+
+        if index in self.children:
+            return self.children[index]
+
+        value = self.values[index]
+
+        if not isinstance(value, Store):
+            return value
+
+        child = self.children[index] = view(value)
+        return child
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.item(i) for i in range(*index.indices(len(self.values)))]
+        return self.item(index)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, StoreSequence)):
+            return list(self) == list(other)  # type: ignore[misc]
+        return NotImplemented
+
+    def to_python_value(self) -> PythonValue:
+        return self.store.to_python_value()
+
+    def __repr__(self) -> str:
+        return f"StoreSequence({self.to_python_value()!r})"
+
+
+class ResolvingError(ValueError):
+    """
+    Assignment inside a value that is not an object: `key` is the part of `path` that holds `value`
+    """
+
+    def __init__(self, path: KeyChain, key: str, value: StateValue) -> None:
+        super().__init__("Unknown resolving error occured, report this to the developer", path, key, value)
+        self.path = path
+        self.key = key
+        self.value = value
+
+    def __reduce__(self) -> Tuple[type, Tuple[KeyChain, str, StateValue]]:
+        return ResolvingError, (self.path, self.key, self.value)
+
+
 class ReadState:
     def __init__(self) -> None:
-        self.constraints: Dict[Tuple[str, ...], List[Constraint]] = {}
+        self.constraints = ConstraintIndex()
         self.keys = Store()
 
     def create_path(self, path: KeyChain):
@@ -99,12 +307,7 @@ class ReadState:
             if key in store:
                 new_store: StateValue = store[key]
                 if not isinstance(new_store, Store):
-                    raise ValueError(
-                        "Unknown resolving error occured, report this to the developer",
-                        path,
-                        key,
-                        new_store,
-                    )
+                    raise ResolvingError(path, key, new_store)
             else:
                 new_store = Store()
                 store[key] = new_store
@@ -127,6 +330,43 @@ class ReadState:
 
         store[last_key] = value
 
+    def assign_tree(self, op: Assign):
+        """
+        Assigns a statement straight into the tree, without flattening nested objects into paths.
+        Only valid if there are no constraints
+        """
+        self.assign_nested(self.keys, op, [])
+
+    def assign_nested(self, store: Store, op: Assign, prefix: KeyChain):
+        key = op.key
+        value = op.value
+
+        if isinstance(value, Object) and value.pairs:
+            inner = self.descend(store, key, prefix)
+
+            prefix.extend(key)
+            for pair in value.pairs:
+                self.assign_nested(inner, pair, prefix)
+            del prefix[len(prefix) - len(key) :]
+            return
+
+        parent = self.descend(store, key[:-1], prefix)
+        parent[key[-1]] = Store() if isinstance(value, Object) else value
+
+    def descend(self, store: Store, path: KeyChain, prefix: KeyChain) -> Store:
+        for key in path:
+            if key in store:
+                new_store: StateValue = store[key]
+                if not isinstance(new_store, Store):
+                    raise ResolvingError(prefix + path, key, new_store)
+            else:
+                new_store = Store()
+                store[key] = new_store
+
+            store = new_store
+
+        return store
+
     def resolve_path(self, path: KeyChain) -> Store | None:
         store = self.keys
 
@@ -143,37 +383,34 @@ class ReadState:
         return store
 
     def add_constraint(self, constraint: Constraint):
-        key = constraint.key
-
         path = list(constraint.key)
 
         store = self.resolve_path(path)
 
         if store:
-            for value in store.keys.values():
+            check = constraint.compile()
+
+            for value in store.values():
                 try:
-                    constraint.check(value)
+                    check(value)
                 except:
-                    warn("Too late, it's already done")
+                    self.too_late(constraint)
                     break
 
-        if key not in self.constraints:
-            self.constraints[key] = []
+        self.constraints.add(constraint)
 
-        self.constraints[key].append(constraint)
+    def too_late(self, constraint: Constraint):
+        """
+        Called when a constraint is added after a value it doesn't allow
+        """
+        warn("Too late, it's already done")
 
     def check_constraint(self, op: Assign):
-        path = tuple(op.key)
-        constraints = self.constraints.get(path)
-
-        if not constraints:
-            return
-
-        for constraint in constraints:
-            constraint.check(op.value)
+        self.constraints.check(op.key, op.value)
 
     def assign(self, op: Assign):
-        self.check_constraint(op)
+        if op.key[-1] in self.constraints.names:
+            self.check_constraint(op)
         self.assign_path(op.key, op.value)
 
     def to_dict(self) -> PythonValue:
@@ -185,28 +422,41 @@ class Reader:
         self,
         s: str,
         parse_funcs: ParseFuncs,
+        lexer: LexerName = "contextual",
     ) -> ReadState:
+        return self.read_tree(parse(s, parse_funcs, lexer))
+
+    def read_tree(self, tree: List[Operation]) -> ReadState:
+        if self.is_plain(tree):
+            state = ReadState()
+            for operation in tree:
+                if isinstance(operation, Assign):
+                    state.assign_tree(operation)
+            return state
+
+        return self.read_timeline([self.process_operation(operation) for operation in tree])
+
+    def read_timeline(self, timeline: Sequence[Sequence[Operation]]) -> ReadState:
+        """
+        Applies processed statements (see `process_operation`) in the order of time travel
+        """
         state = ReadState()
-        tree = parse(s, parse_funcs)
-
-        statements: List[Tuple[Operation, int]] = []
-
-        for i, operation in enumerate(tree):
-            statements.extend((op, i) for op in self.process_operation(operation))
 
-        def key_func(statement: Tuple[Operation, int]) -> float:
-            [operation, index] = statement
-
-            if operation.offset:
-                return index + operation.offset - 1 / 100000
-
-            return index
-
-        for statement in sorted(statements, key=key_func):
-            self.apply_operation(statement[0], state)
+        for operation in Schedule(timeline):
+            self.apply_operation(operation, state)
 
         return state
 
+    def is_plain(self, tree: List[Operation]) -> bool:
+        """
+        True if the document has no time travel and no constraints,
+        so statements can be applied in order without flattening objects
+        """
+        for operation in tree:
+            if operation.offset or isinstance(operation, Constraint):
+                return False
+        return True
+
     def process_operation(self, operation: Operation) -> Sequence[Operation]:
         if operation.op_type == "noop":
             return []
@@ -221,6 +471,123 @@ class Reader:
             state.add_constraint(operation)
 
 
+class TimedReader(Reader):
+    """
+    Reader that adds the time of every phase and the counters to `stats`
+    """
+
+    def __init__(self, stats: LoadStats) -> None:
+        self.stats = stats
+
+    def read(
+        self,
+        s: str,
+        parse_funcs: ParseFuncs,
+        lexer: LexerName = "contextual",
+    ) -> ReadState:
+        return self.read_tree(parse(s, parse_funcs, lexer, self.stats))
+
+    def read_tree(self, tree: List[Operation]) -> ReadState:
+        stats = self.stats
+        state = ReadState()
+        stats.statements += len(tree)
+
+        if self.is_plain(tree):
+            with stats.phase("assign"):
+                for operation in tree:
+                    if isinstance(operation, Assign):
+                        state.assign_tree(operation)
+
+            for operation in tree:
+                if isinstance(operation, Assign):
+                    stats.assignments += operation.count()
+            return state
+
+        with stats.phase("unwind"):
+            timeline = [self.process_operation(operation) for operation in tree]
+
+        with stats.phase("schedule"):
+            operations = Schedule(timeline).order()
+
+        with stats.phase("assign"):
+            for operation in operations:
+                self.apply_operation(operation, state)
+
+        for operation in operations:
+            if isinstance(operation, Assign):
+                stats.assignments += 1
+        stats.constraints_checked += state.constraints.checked
+
+        return state
+
+
+def count_nodes(value: PythonValue) -> int:
+    if isinstance(value, dict):
+        return 1 + sum(map(count_nodes, value.values()))
+    if isinstance(value, list):
+        return 1 + sum(map(count_nodes, value))
+    return 1
+
+
+class StreamReader(Reader):
+    """
+    Applies statements while the file is being parsed.
+
+    Operations of the last `window` statements are kept unapplied, so `return N`
+    works for N up to `window`. Operations moved with `skip N` wait for N statements.
+    Operations are ordered exactly as in Reader.read
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        self.window = window
+
+    def iter_read(
+        self,
+        file: SupportsRead[str],
+        parse_funcs: ParseFuncs,
+        state: ReadState,
+        lexer: LexerName = "contextual",
+    ) -> Iterator[Operation]:
+        # position -> (operations travelled to it, operations of the statement itself)
+        buckets: Dict[int, Tuple[List[Operation], List[Operation]]] = {}
+        positions: List[int] = []
+        applied_until: int | None = None
+
+        for i, statement in enumerate(parse_stream(file, parse_funcs, lexer)):
+            for operation in self.process_operation(statement):
+                position = i + operation.offset
+
+                if applied_until is not None and position <= applied_until:
+                    raise ValueError(
+                        f"Statement {i} travels {-operation.offset} statements back, "
+                        f"but only {self.window} last statements are kept while streaming. "
+                        "Increase the window or use wtfl.load"
+                    )
+
+                if position not in buckets:
+                    buckets[position] = ([], [])
+                    heapq.heappush(positions, position)
+
+                buckets[position][not operation.offset].append(operation)
+
+            applied_until = i - self.window
+
+            while positions and positions[0] <= applied_until:
+                yield from self.apply_bucket(buckets.pop(heapq.heappop(positions)), state)
+
+        while positions:
+            yield from self.apply_bucket(buckets.pop(heapq.heappop(positions)), state)
+
+    def apply_bucket(
+        self, bucket: Tuple[List[Operation], List[Operation]], state: ReadState
+    ) -> Iterator[Operation]:
+        for operations in bucket:
+            for operation in operations:
+                self.apply_operation(operation, state)
+                yield operation
+
+
+@overload
 def loads(
     s: str,
     *,
@@ -228,13 +595,74 @@ def loads(
     parse_int: ParseFunc | None = None,
     parse_roman: ParseFunc | None = None,
     parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: Literal[False] = False,
 ) -> PythonValue:
-    state: ReadState = Reader().read(
-        s, (parse_float, parse_int, parse_roman, parse_numbers)
-    )
-    return state.to_dict()
+    ...
+
+
+@overload
+def loads(
+    s: str,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: Literal[True],
+) -> StoreMapping:
+    ...
+
+
+@overload
+def loads(
+    s: str,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: bool = False,
+) -> PythonValue | StoreMapping:
+    ...
 
 
+def loads(
+    s: str,
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: bool = False,
+) -> PythonValue | StoreMapping:
+    parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+
+    if stats is None:
+        state = Reader().read(s, parse_funcs, lexer)
+        return StoreMapping(state.keys) if lazy else state.to_dict()
+
+    state = TimedReader(stats).read(s, parse_funcs, lexer)
+    stats.calls += 1
+
+    if lazy:
+        return StoreMapping(state.keys)
+
+    with stats.phase("materialize"):
+        result = state.to_dict()
+
+    stats.nodes += count_nodes(result)
+    return result
+
+
+@overload
 def load(
     file: SupportsRead[str],
     *,
@@ -242,11 +670,84 @@ def load(
     parse_int: ParseFunc | None = None,
     parse_roman: ParseFunc | None = None,
     parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: Literal[False] = False,
 ) -> PythonValue:
+    ...
+
+
+@overload
+def load(
+    file: SupportsRead[str],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: Literal[True],
+) -> StoreMapping:
+    ...
+
+
+@overload
+def load(
+    file: SupportsRead[str],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: bool = False,
+) -> PythonValue | StoreMapping:
+    ...
+
+
+def load(
+    file: SupportsRead[str],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    stats: LoadStats | None = None,
+    lazy: bool = False,
+) -> PythonValue | StoreMapping:
     return loads(
         file.read(),
         parse_float=parse_float,
         parse_int=parse_int,
         parse_roman=parse_roman,
         parse_numbers=parse_numbers,
+        lexer=lexer,
+        stats=stats,
+        lazy=lazy,
+    )
+
+
+def iterload(
+    file: SupportsRead[str],
+    *,
+    parse_float: ParseFunc | None = None,
+    parse_int: ParseFunc | None = None,
+    parse_roman: ParseFunc | None = None,
+    parse_numbers: ParseFunc | None = None,
+    lexer: LexerName = "contextual",
+    window: int = 1024,
+    state: ReadState | None = None,
+) -> Iterator[Operation]:
+    """
+    Reads a file statement by statement, applying operations to `state` as they are resolved.
+    Yields every operation after it is applied; use `state.to_dict()` for the result
+    """
+    return StreamReader(window).iter_read(
+        file,
+        (parse_float, parse_int, parse_roman, parse_numbers),
+        state if state is not None else ReadState(),
+        lexer,
     )
@@ -0,0 +1,189 @@
+from __future__ import annotations
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Set, Tuple, Union
+
+from .internal_types import SupportsRead
+from .parser import LexerName, ParseFunc, ParseFuncs
+from .reader import PythonValue, loads
+
+Path = Union[str, "os.PathLike[str]"]
+# content hash and parse hooks
+CacheKey = Tuple[Hashable, ...]
+# (mtime, size) of a file when it was read, and the key of its content
+FileStamp = Tuple[Tuple[int, int], CacheKey]
+
+
+def copy_value(value: PythonValue) -> PythonValue:
+    """
+    Copies lists and dicts of a loaded value, other values are immutable
+    """
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+class LoadCache:
+    """
+    Cache of loaded documents, keyed by content hash and parse hooks.
+
+    Least recently used documents are evicted once there are more than `maxsize` of them
+    or their sources are longer than `max_chars` in total.
+    `load` of a path skips reading the file if its mtime and size didn't change.
+    Every call returns a fresh copy, so callers can't change cached results
+    """
+
+    def __init__(self, maxsize: int = 128, max_chars: int | None = None) -> None:
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self.entries: OrderedDict[CacheKey, Tuple[PythonValue, int]] = OrderedDict()
+        self.files: Dict[str, FileStamp] = {}
+        # paths whose stamps point to a key, so they are forgotten with it
+        self.paths: Dict[CacheKey, Set[str]] = {}
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def key(self, s: str, parse_funcs: ParseFuncs) -> CacheKey:
+        digest = hashlib.sha256(s.encode("utf-8", "surrogatepass")).digest()
+        return (digest, *parse_funcs)
+
+    def put(self, key: CacheKey, value: PythonValue, size: int) -> None:
+        with self.lock:
+            if key in self.entries:
+                return
+
+            self.entries[key] = (value, size)
+            self.chars += size
+
+            while self.entries and (
+                len(self.entries) > self.maxsize
+                or (self.max_chars is not None and self.chars > self.max_chars)
+            ):
+                evicted, (_, evicted_size) = self.entries.popitem(last=False)
+                self.chars -= evicted_size
+
+                for path in self.paths.pop(evicted, ()):
+                    del self.files[path]
+
+    def remember(self, path: str, stamp: Tuple[int, int], key: CacheKey) -> None:
+        """
+        Records the stamp of a file whose content is cached under `key`. Called with the lock held
+        """
+        known = self.files.get(path)
+
+        if known is not None:
+            paths = self.paths[known[1]]
+            paths.discard(path)
+
+            if not paths:
+                del self.paths[known[1]]
+
+        self.files[path] = (stamp, key)
+        self.paths.setdefault(key, set()).add(path)
+
+    def loads(
+        self,
+        s: str,
+        *,
+        parse_float: ParseFunc | None = None,
+        parse_int: ParseFunc | None = None,
+        parse_roman: ParseFunc | None = None,
+        parse_numbers: ParseFunc | None = None,
+        lexer: LexerName = "contextual",
+    ) -> PythonValue:
+        parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+        return self.loads_key(s, self.key(s, parse_funcs), parse_funcs, lexer)
+
+    def loads_key(
+        self, s: str, key: CacheKey, parse_funcs: ParseFuncs, lexer: LexerName
+    ) -> PythonValue:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is not None:
+            return copy_value(entry[0])
+
+        value = loads(
+            s,
+            parse_float=parse_funcs[0],
+            parse_int=parse_funcs[1],
+            parse_roman=parse_funcs[2],
+            parse_numbers=parse_funcs[3],
+            lexer=lexer,
+        )
+        self.put(key, value, len(s))
+
+        return copy_value(value)
+
+    def load(
+        self,
+        file: SupportsRead[str] | Path,
+        *,
+        parse_float: ParseFunc | None = None,
+        parse_int: ParseFunc | None = None,
+        parse_roman: ParseFunc | None = None,
+        parse_numbers: ParseFunc | None = None,
+        lexer: LexerName = "contextual",
+    ) -> PythonValue:
+        """
+        Loads a file object or a path. Paths are not read again while their mtime and size stay the same
+        """
+        parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+
+        if not isinstance(file, (str, os.PathLike)):
+            s = file.read()
+            return self.loads_key(s, self.key(s, parse_funcs), parse_funcs, lexer)
+
+        path = os.path.abspath(file)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        entry = None
+
+        with self.lock:
+            known = self.files.get(path)
+
+            if known is not None and known[0] == stamp and known[1][1:] == parse_funcs:
+                entry = self.entries.get(known[1])
+
+                if entry is not None:
+                    self.entries.move_to_end(known[1])
+                    self.hits += 1
+
+        if entry is not None:
+            return copy_value(entry[0])
+
+        with open(path, encoding="utf-8") as f:
+            s = f.read()
+
+        key = self.key(s, parse_funcs)
+        value = self.loads_key(s, key, parse_funcs, lexer)
+
+        with self.lock:
+            # a document that was evicted right away (or failed to load) isn't remembered
+            if key in self.entries:
+                self.remember(path, stamp, key)
+
+        return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.files.clear()
+            self.paths.clear()
+            self.chars = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,276 @@
+from __future__ import annotations
+import re
+import string
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from lark import Token
+from lark.exceptions import UnexpectedCharacters, UnexpectedToken
+from lark.common import LexerConf
+from lark.lexer import Lexer, TerminalDef
+
+Match = Callable[[str, int], Optional["re.Match[str]"]]
+Candidate = Tuple[str, Match]
+Dispatch = Tuple[Dict[str, Tuple[Candidate, ...]], Tuple[Candidate, ...]]
+FullMatch = Callable[[str], Optional["re.Match[str]"]]
+Unless = Dict[str, List[Tuple[str, FullMatch]]]
+
+_letters = string.ascii_letters
+_digits = string.digits
+
+# first characters of WTFL regexp terminals (in ASCII),
+# string terminals are derived from their value, unknown terminals are tried everywhere
+_first_chars: Dict[str, str] = {
+    "WS": string.whitespace + "\x1c\x1d\x1e\x1f",
+    "COMMENT": ".",
+    "IS": "iIaA'dDbB",
+    "ISNT": "iIaA'",
+    "THAT": "tT",
+    "HAVE": "hH'",
+    "HAVENT": "hH'",
+    "CANT": "cC",
+    "BOOL": "tTfF",
+    "PREFIX": "aAtTdDlLuU",
+    "NAME": _letters + "_-",
+    "OBJECT_TAIL": "tT",
+    "INT": _digits,
+    "FLOAT": _digits + ".",
+    "BIN_INT": "0",
+    "OCT_INT": "0",
+    "DUODEC_INT": "0",
+    "HEX_INT": "0",
+    "VIG_INT": "0",
+    "UNARY": "0",
+    "DEC_WTF": "0",
+    "ROMAN_INT": "0",
+    "STRING": '"',
+}
+
+_ascii = "".join(map(chr, range(128)))
+
+
+def _first_chars_of(terminal: TerminalDef) -> str | None:
+    pattern = terminal.pattern
+
+    if pattern.type == "str":
+        first: str = pattern.value[0]
+        if "i" in pattern.flags:
+            return first.lower() + first.upper()
+        return first
+
+    return _first_chars.get(terminal.name)
+
+
+def _sort_key(terminal: TerminalDef) -> Tuple[int, int, int, str]:
+    pattern = terminal.pattern
+    return (-terminal.priority, -pattern.max_width, -len(pattern.value), terminal.name)
+
+
+class WTFLScanner(Lexer):
+    """
+    Contextual scanner for the WTFL token set.
+
+    Produces the same tokens as Lark's contextual lexer:
+    terminals acceptable in the current parser state are tried in Lark's order
+    (priority, width, pattern length, name), but only the ones that can start
+    with the current character, and string terminals fully matched by a regexp
+    terminal of the same priority are folded into it the same way Lark does
+    """
+
+    __future_interface__ = 1
+
+    def __init__(self, conf: LexerConf) -> None:
+        self.flags: int = conf.g_regex_flags
+        self.terminals: List[TerminalDef] = sorted(conf.terminals, key=_sort_key)
+        self.terminals_by_name: Dict[str, TerminalDef] = {
+            t.name: t for t in self.terminals
+        }
+        self.ignore: FrozenSet[str] = frozenset(conf.ignore)
+        self.matchers: Dict[str, Match] = {
+            t.name: re.compile(t.pattern.to_regexp(), self.flags).match
+            for t in self.terminals
+        }
+        self.dispatch_by_accepts: Dict[FrozenSet[str], Tuple[Dispatch, Unless]] = {}
+        self.dispatch_by_state: Dict[int, Tuple[Dispatch, Unless]] = {}
+        self.root = self.build(frozenset(self.terminals_by_name))
+
+        # whitespace can only start WS, so it is skipped before dispatching
+        known = all(
+            t.pattern.type == "str" or t.name in _first_chars for t in self.terminals
+        )
+        self.skip_whitespace: Match | None = None
+        if known and "WS" in self.ignore:
+            self.skip_whitespace = self.matchers["WS"]
+
+    def build(self, accepts: FrozenSet[str]) -> Tuple[Dispatch, Unless]:
+        terminals = [
+            t for t in self.terminals if t.name in accepts or t.name in self.ignore
+        ]
+
+        unless: Unless = {}
+        embedded = set()
+
+        for retok in terminals:
+            if retok.pattern.type != "re":
+                continue
+
+            for strtok in terminals:
+                if strtok.pattern.type != "str" or strtok.priority != retok.priority:
+                    continue
+
+                value: str = strtok.pattern.value
+                match = self.matchers[retok.name](value, 0)
+
+                if not (match and match.group(0) == value):
+                    continue
+
+                fullmatch = re.compile(strtok.pattern.to_regexp(), self.flags).fullmatch
+                unless.setdefault(retok.name, []).append((strtok.name, fullmatch))
+
+                if frozenset(strtok.pattern.flags) <= frozenset(retok.pattern.flags):
+                    embedded.add(strtok.name)
+
+        candidates = [
+            (t, (t.name, self.matchers[t.name]))
+            for t in terminals
+            if t.name not in embedded
+        ]
+
+        table: Dict[str, Tuple[Candidate, ...]] = {}
+
+        for char in _ascii:
+            table[char] = tuple(
+                candidate
+                for terminal, candidate in candidates
+                if char in (_first_chars_of(terminal) or char)
+            )
+
+        fallback = tuple(candidate for _, candidate in candidates)
+
+        return (table, fallback), unless
+
+    def for_state(self, position: int, accepts: FrozenSet[str]) -> Tuple[Dispatch, Unless]:
+        result = self.dispatch_by_accepts.get(accepts)
+
+        if result is None:
+            result = self.build(accepts)
+            self.dispatch_by_accepts[accepts] = result
+
+        self.dispatch_by_state[position] = result
+        return result
+
+    def lex(self, lexer_state, parser_state):
+        text = lexer_state.text
+        if not isinstance(text, str):
+            text = text.text  # lark >= 1.2 passes a TextSlice
+
+        line_ctr = lexer_state.line_ctr
+        states = parser_state.parse_conf.parse_table.states
+        dispatch_by_state = self.dispatch_by_state
+        ignore = self.ignore
+
+        pos = line_ctr.char_pos
+        line = line_ctr.line
+        line_start = line_ctr.line_start_pos
+        end = len(text)
+        skip = self.skip_whitespace
+
+        while True:
+            if skip:
+                match = skip(text, pos)
+                if match:
+                    value = match.group(0)
+                    if "\n" in value:
+                        line += value.count("\n")
+                        line_start = pos + value.rindex("\n") + 1
+                    pos += len(value)
+
+            if pos >= end:
+                break
+
+            position = parser_state.position
+            current = dispatch_by_state.get(position)
+            if current is None:
+                current = self.for_state(position, frozenset(states[position]))
+
+            (table, fallback), unless = current
+
+            match = None
+            type_ = ""
+            for type_, matcher in table.get(text[pos], fallback):
+                match = matcher(text, pos)
+                if match:
+                    break
+
+            if not match:
+                self.fail(text, pos, line, pos - line_start + 1, lexer_state, parser_state)
+
+            value = match.group(0)
+
+            if type_ in unless:
+                for str_type, fullmatch in unless[type_]:
+                    if fullmatch(value):
+                        type_ = str_type
+                        break
+
+            new_pos = pos + len(value)
+            start_line = line
+            start_column = pos - line_start + 1
+
+            if "\n" in value:
+                line += value.count("\n")
+                line_start = pos + value.rindex("\n") + 1
+
+            if type_ not in ignore:
+                token = Token(
+                    type_,
+                    value,
+                    pos,
+                    start_line,
+                    start_column,
+                    line,
+                    new_pos - line_start + 1,
+                    new_pos,
+                )
+                line_ctr.char_pos = new_pos
+                line_ctr.line = line
+                line_ctr.line_start_pos = line_start
+                line_ctr.column = new_pos - line_start + 1
+                lexer_state.last_token = token
+                yield token
+
+            pos = new_pos
+
+        line_ctr.char_pos = pos
+        line_ctr.line = line
+        line_ctr.line_start_pos = line_start
+        line_ctr.column = pos - line_start + 1
+
+    def fail(self, text, pos, line, column, lexer_state, parser_state):
+        states = parser_state.parse_conf.parse_table.states
+        allowed = set(states[parser_state.position]) - self.ignore
+        last_token = lexer_state.last_token
+        history = last_token and [last_token]
+
+        (table, fallback), _ = self.root
+        for type_, matcher in table.get(text[pos], fallback):
+            match = matcher(text, pos)
+            if match:
+                token = Token(type_, match.group(0), pos, line, column)
+                raise UnexpectedToken(
+                    token,
+                    allowed,
+                    state=parser_state,
+                    token_history=[last_token],
+                    terminals_by_name=self.terminals_by_name,
+                )
+
+        raise UnexpectedCharacters(
+            text,
+            pos,
+            line,
+            column,
+            allowed=allowed or {"<END-OF-FILE>"},
+            token_history=history,
+            state=parser_state,
+            terminals_by_name=self.terminals_by_name,
+        )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import math
+from itertools import count
+from typing import Dict, Iterator, List, Sequence
+
+from .internal_types import Operation
+
+
+class Schedule:
+    """
+    Orders operations of a document by time travel in linear time.
+
+    Statement i is at position i, an operation with an offset lands at i + offset.
+    Operations that travelled to a position come before the ones of the statement itself,
+    operations at the same position keep the order of their statements.
+    Positions outside of the document (or non-integer ones) are sorted separately
+    """
+
+    def __init__(self, timeline: Sequence[Sequence[Operation]]) -> None:
+        self.natives: List[Sequence[Operation]] = list(timeline)
+        self.travellers: List[List[Operation] | None] = [None] * len(timeline)
+        self.outside: Dict[float, List[Operation]] = {}
+
+        for index, operations in enumerate(timeline):
+            moved = False
+
+            for operation in operations:
+                if operation.offset:
+                    self.add_traveller(index + operation.offset, operation)
+                    moved = True
+
+            if moved:
+                self.natives[index] = [op for op in operations if not op.offset]
+
+    def add_traveller(self, position: float, operation: Operation) -> None:
+        if position == int(position) and 0 <= position < len(self.natives):
+            index = int(position)
+            bucket = self.travellers[index]
+
+            if bucket is None:
+                self.travellers[index] = [operation]
+            else:
+                bucket.append(operation)
+            return
+
+        if position not in self.outside:
+            self.outside[position] = []
+
+        self.outside[position].append(operation)
+
+    def order(self) -> List[Operation]:
+        result: List[Operation] = []
+        extend = result.extend
+
+        outside = sorted(self.outside)
+        outside.append(math.inf)
+        outside_index = 0
+        next_outside = outside[0]
+
+        for index, travellers, natives in zip(count(), self.travellers, self.natives):
+            while next_outside < index:
+                extend(self.outside[next_outside])
+                outside_index += 1
+                next_outside = outside[outside_index]
+
+            if travellers is not None:
+                extend(travellers)
+
+            extend(natives)
+
+        for position in outside[outside_index:-1]:
+            extend(self.outside[position])
+
+        return result
+
+    def __iter__(self) -> Iterator[Operation]:
+        return iter(self.order())
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterator
+
+# in the order they run:
+# parse - Lark parsing and lexing (without transformer callbacks)
+# transform - WTFLTransformer callbacks
+# unwind - flattening statements into operations (Reader.process_operation)
+# schedule - ordering operations by time travel
+# assign - applying operations to the state (ReadState.assign / assign_tree)
+# materialize - converting the state into Python values (Store.to_python_value)
+PHASES = ("parse", "transform", "unwind", "schedule", "assign", "materialize")
+
+
+class LoadStats:
+    """
+    Timings and counters of `load` / `loads` calls, pass it as `stats=`.
+    Values are added up over every call the object is passed to
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        # seconds spent in every phase, see PHASES
+        self.times: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        # top-level statements
+        self.statements = 0
+        # assignments of single values, after nested objects are flattened
+        self.assignments = 0
+        # assignments checked against constraints of their path
+        self.constraints_checked = 0
+        # objects, arrays and values in the result
+        self.nodes = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(self.times.values())
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "calls": self.calls,
+            "times": dict(self.times),
+            "total": self.total,
+            "statements": self.statements,
+            "assignments": self.assignments,
+            "constraints_checked": self.constraints_checked,
+            "nodes": self.nodes,
+        }
+
+    def __repr__(self) -> str:
+        times = ", ".join(f"{name}={time * 1e3:.2f}ms" for name, time in self.times.items())
+        return (
+            f"LoadStats(calls={self.calls}, {times}, statements={self.statements}, "
+            f"assignments={self.assignments}, constraints_checked={self.constraints_checked}, "
+            f"nodes={self.nodes})"
+        )
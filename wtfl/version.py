@@ -0,0 +1,40 @@
+from __future__ import annotations
+import os
+import re
+
+_PYPROJECT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pyproject.toml")
+
+_version: str | None = None
+
+
+def package_version() -> str:
+    """
+    Version of the installed package, or the one in pyproject.toml for a source checkout.
+    Looked up on first use, since reading package metadata is slow
+    """
+    global _version
+
+    if _version is None:
+        _version = read_version()
+
+    return _version
+
+
+def read_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # Python 3.7
+        pass
+    else:
+        try:
+            return version("wtfl")
+        except PackageNotFoundError:
+            pass
+
+    try:
+        with open(_PYPROJECT, encoding="utf-8") as file:
+            match = re.search(r'^version = "([^"]+)"', file.read(), re.MULTILINE)
+    except OSError:
+        match = None
+
+    return match.group(1) if match else "unknown"
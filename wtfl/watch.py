@@ -0,0 +1,283 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple, Union
+
+from .parser import LexerName, ParseFunc, ParseFuncs
+from .reader import PythonValue, load
+from .result_cache import copy_value
+
+Path = Union[str, "os.PathLike[str]"]
+# keys from the outermost one
+KeyPath = Tuple[str, ...]
+# (mtime, size, inode) of a file, None if it doesn't exist
+FileStamp = Union[Tuple[int, int, int], None]
+Subscriber = Callable[["Delta"], None]
+ErrorHandler = Callable[[Exception], None]
+
+logger = logging.getLogger(__name__)
+
+
+def same(a: PythonValue, b: PythonValue) -> bool:
+    """
+    Like ==, but 1, 1.0 and True are different values
+    """
+    if type(a) is not type(b):
+        return False
+
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[key], b[key]) for key in a)
+
+    return a == b
+
+
+class Delta:
+    """
+    Difference between two loaded documents, by key paths.
+
+    A new or removed object is one path, not a path for every value inside it.
+    Arrays are compared as values, a changed array is one changed path
+    """
+
+    def __init__(self) -> None:
+        self.added: Dict[KeyPath, PythonValue] = {}
+        self.removed: Dict[KeyPath, PythonValue] = {}
+        # path -> (old value, new value)
+        self.changed: Dict[KeyPath, Tuple[PythonValue, PythonValue]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self) -> str:
+        return f"Delta(added={list(self.added)}, removed={list(self.removed)}, changed={list(self.changed)})"
+
+    def apply(self, target: Dict[str, PythonValue]) -> None:
+        """
+        Changes a copy of the old document into the new one in place.
+        New values are copied, so changing `target` later doesn't change the delta
+        """
+        for path in self.removed:
+            parent = descend(target, path[:-1])
+            del parent[path[-1]]
+
+        for path, (_, value) in self.changed.items():
+            descend(target, path[:-1])[path[-1]] = copy_value(value)
+
+        for path, value in self.added.items():
+            descend(target, path[:-1])[path[-1]] = copy_value(value)
+
+
+def descend(target: Dict[str, PythonValue], path: KeyPath) -> Dict[str, PythonValue]:
+    for key in path:
+        child = target.get(key)
+
+        if not isinstance(child, dict):
+            child = {}
+            target[key] = child
+
+        target = child
+
+    return target
+
+
+def diff(old: PythonValue, new: PythonValue) -> Delta:
+    """
+    Key paths that were added, removed or changed between two loaded documents
+    """
+    delta = Delta()
+    compare(old, new, (), delta)
+    return delta
+
+
+def compare(old: PythonValue, new: PythonValue, path: KeyPath, delta: Delta) -> None:
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        if not same(old, new):
+            delta.changed[path] = (old, new)
+        return
+
+    for key, value in old.items():
+        if key not in new:
+            delta.removed[path + (key,)] = value
+
+    for key, value in new.items():
+        if key in old:
+            compare(old[key], value, path + (key,), delta)
+        else:
+            delta.added[path + (key,)] = value
+
+
+def file_stamp(path: str) -> FileStamp:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class Watcher:
+    """
+    Loads a file and loads it again in a background thread when it changes.
+
+    Changes are found by polling the mtime, size and inode of the file every `interval` seconds.
+    The file is loaded once they didn't change for `debounce` seconds, so a burst of writes
+    is loaded once. Subscribers are called in the watcher thread with a `Delta`
+    from the previous value; if the file can't be loaded, the previous value is kept
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        parse_float: ParseFunc | None = None,
+        parse_int: ParseFunc | None = None,
+        parse_roman: ParseFunc | None = None,
+        parse_numbers: ParseFunc | None = None,
+        lexer: LexerName = "contextual",
+        interval: float = 0.5,
+        debounce: float = 0.1,
+        on_error: ErrorHandler | None = None,
+    ) -> None:
+        self.path = os.path.abspath(path)
+        self.parse_funcs: ParseFuncs = (parse_float, parse_int, parse_roman, parse_numbers)
+        self.lexer: LexerName = lexer
+        self.interval = interval
+        self.debounce = debounce
+        self.on_error = on_error
+
+        self.subscribers: List[Subscriber] = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: threading.Thread | None = None
+
+        # a changed stamp waiting for `debounce` to pass, and when it was seen
+        self.pending: FileStamp = None
+        self.pending_since = 0.0
+
+        # the first load is done right away, so errors in the file are raised here
+        self.stamp, self._value = self.read()
+
+    @property
+    def value(self) -> PythonValue:
+        """
+        The last loaded value. Don't change it, use `Delta.apply` on a copy
+        """
+        return self._value
+
+    def read(self) -> Tuple[FileStamp, PythonValue]:
+        # stat goes first, so a change made while reading is loaded on the next poll
+        stamp = file_stamp(self.path)
+
+        with open(self.path, encoding="utf-8") as file:
+            value = load(
+                file,
+                parse_float=self.parse_funcs[0],
+                parse_int=self.parse_funcs[1],
+                parse_roman=self.parse_funcs[2],
+                parse_numbers=self.parse_funcs[3],
+                lexer=self.lexer,
+            )
+
+        return stamp, value
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """
+        Calls `callback(delta)` after every change of the value. Returns a function that unsubscribes
+        """
+        with self.lock:
+            self.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self.lock:
+                if callback in self.subscribers:
+                    self.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def poll(self) -> Delta | None:
+        """
+        Checks the file once, loads it if it changed and `debounce` passed.
+        Returns the delta if subscribers were notified.
+        Called by the watcher thread, or directly without `start`
+        """
+        stamp = file_stamp(self.path)
+
+        if stamp == self.stamp:
+            self.pending = None
+            return None
+
+        now = time.monotonic()
+
+        if stamp != self.pending:
+            self.pending = stamp
+            self.pending_since = now
+
+            if self.debounce > 0:
+                return None
+
+        if now - self.pending_since < self.debounce:
+            return None
+
+        self.pending = None
+
+        try:
+            stamp, value = self.read()
+        except Exception as e:
+            # don't load the same broken file again
+            self.stamp = stamp
+            self.report(e)
+            return None
+
+        delta = diff(self._value, value)
+        self.stamp, self._value = stamp, value
+
+        if not delta:
+            return None
+
+        with self.lock:
+            subscribers = list(self.subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(delta)
+            except Exception as e:
+                self.report(e)
+
+        return delta
+
+    def report(self, error: Exception) -> None:
+        if self.on_error is None:
+            logger.warning("Error watching %s: %r", self.path, error)
+        else:
+            self.on_error(error)
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval if self.pending is None else self.debounce):
+            self.poll()
+
+    def start(self) -> Watcher:
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name=f"wtfl-watch {self.path}", daemon=True)
+            self.thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+        if self.thread is not None:
+            if self.thread is not threading.current_thread():
+                self.thread.join()
+            self.thread = None
+
+    def __enter__(self) -> Watcher:
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
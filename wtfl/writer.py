@@ -1,10 +1,12 @@
 from __future__ import annotations
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Tuple, Union
 from .internal_types import SupportsWrite
 from .reader import PythonValue
 from json import dumps as jd
+import io
 import random
 import math
+import re
 
 _kws: Dict[str, List[str]] = {
     "have": ["have", "has", "'ve"],
@@ -12,9 +14,38 @@ _kws: Dict[str, List[str]] = {
     "true": ["true", "falsen't"],
     "false": ["false", "truen't"],
     "is": [" is", " are", "'s", "'re", " do", " does", " be"],
-    "haven't": ["haven't", "hasn't", "'ve'n't"],
+    "haven't": ["haven't", "hasn't", "'ven't"],
 }
 
+# the shortest aliases, always used by compact encoders
+_compact_kws: Dict[str, str] = {
+    "have": "'ve",
+    "that": "that",
+    "true": "true",
+    "false": "false",
+    "is": "'s",
+    "haven't": "'ven't",
+}
+
+_bare_key = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# the lexer splits names starting with a keyword, prefixes are only keywords as whole words
+_keyword_start = re.compile(
+    r"is|are|do|be|of|th(?:at|is|ese|ose|ere)|ha[sv]|can|return|skip|stay|to|and|but|also|true|false"
+    r"|(?:an?|the|d[eu]|l[ea]|des|les|um)\b",
+    re.IGNORECASE,
+)
+
+
+def is_bare_key(key: str) -> bool:
+    """
+    True if the key can be written as a name, without quotes
+    """
+    return _bare_key.fullmatch(key) is not None and _keyword_start.match(key) is None
+
+Container = Union[List[PythonValue], Dict[str, PythonValue]]
+# encoded text, or a nested list / dict with its depth
+Chunk = Union[str, Tuple[Container, int]]
+
 
 class WTFLEncoder:
     def __init__(
@@ -24,14 +55,18 @@ class WTFLEncoder:
         indent: int | str | None = 2,
         default: Callable[[object], str] | None = None,
         sort_keys: bool = False,
+        compact: bool = False,
     ):
         self.skipkeys = skipkeys
         self.ensure_ascii = ensure_ascii
         self.default = default
         self.sort_keys = sort_keys
+        self.compact = compact
         self.indent = "  "
         self.statement_sep = "\n" if indent is not None else " "
         self.also = " also" if "\n" not in self.statement_sep else ""
+        # top-level statements are separated by an empty line, unless the output is compact
+        self.toplevel_sep = self.statement_sep * (1 if compact else 2)
 
         if isinstance(indent, int):
             if indent >= 0:
@@ -42,62 +77,100 @@ class WTFLEncoder:
     def random_kw(self, kw_key: str) -> str:
         return random.choice(_kws[kw_key])
 
-    def add_tab(self, text: str) -> str:
-        if not (self.indent or text):
-            return text
-        return self.indent + text.replace("\n", "\n" + self.indent)
+    def keyword(self, kw_key: str) -> str:
+        if self.compact:
+            return _compact_kws[kw_key]
+        return self.random_kw(kw_key)
+
+    def line_break(self, sep: str, depth: int) -> str:
+        if not self.indent:
+            return sep
+        return sep.replace("\n", "\n" + self.indent * depth)
 
-    def make_list(self, obj: List[PythonValue]) -> str:
+    def iter_list(self, obj: List[PythonValue], depth: int) -> Iterator[Chunk]:
         if not obj:
-            return f"{self.random_kw('have')} 0"
+            yield f"{self.keyword('have')} 0"
+            return
+
+        outer = self.line_break(self.statement_sep, depth)
+        sep = self.line_break(self.statement_sep, depth + 1)
+        first = True
+
+        yield self.keyword("have")
+        yield outer + self.indent
 
-        tail = f"{self.random_kw('that')}{self.also}"
+        for item in obj:
+            value = self.resolve(item)
 
-        entries = filter(None, map(self.dumps, obj))
+            if value == "":
+                continue
 
-        result = [
-            self.random_kw("have"),
-            self.add_tab(self.statement_sep.join(entries)),
-            tail,
-        ]
-        return self.statement_sep.join(result)
+            if not first:
+                yield sep
+            first = False
 
-    def make_dict(self, obj: Dict[str, PythonValue], is_toplevel: bool = False) -> str:
-        sep = self.statement_sep * (1 + is_toplevel)
+            yield value if isinstance(value, str) else (value, depth + 1)
+
+        yield outer
+        yield f"{self.keyword('that')}{self.also}"
+
+    def iter_dict(
+        self, obj: Dict[str, PythonValue], is_toplevel: bool, depth: int
+    ) -> Iterator[Chunk]:
+        if is_toplevel:
+            outer = ""
+            sep = self.line_break(self.toplevel_sep, depth)
+            inner_depth = depth
+        else:
+            outer = self.line_break(self.statement_sep, depth)
+            sep = self.line_break(self.statement_sep, depth + 1)
+            inner_depth = depth + 1
+
+            yield self.keyword("have")
+            yield outer + self.indent
 
         obj_iter = obj.items() if not self.sort_keys else sorted(obj.items())
+        first = True
 
-        def pair_filter(kv: Tuple[str, str]) -> bool:
-            return all(kv)
+        for key, item in obj_iter:
+            encoded_key = self.encode_key(key)
 
-        filtered = filter(
-            pair_filter,
-            [(self.dumps(key), self.dumps(value)) for key, value in obj_iter],
-        )
+            value = self.resolve(item)
 
-        entries = (f"{k}{self.random_kw('is')} {v}" for (k, v) in filtered)
+            if not encoded_key or value == "":
+                continue
 
-        if is_toplevel:
-            return sep.join(entries)
+            if not first:
+                yield sep
+            first = False
 
-        tail = f"{self.random_kw('that')}{self.also}"
+            if isinstance(value, str):
+                yield f"{encoded_key}{self.keyword('is')} {value}"
+            else:
+                yield f"{encoded_key}{self.keyword('is')} "
+                yield value, inner_depth
 
-        result = [self.random_kw("have"), self.add_tab(sep.join(entries)), tail]
+        if not is_toplevel:
+            yield outer
+            yield f"{self.keyword('that')}{self.also}"
 
-        return sep.join(result)
+    def encode_key(self, key: PythonValue) -> str:
+        if self.compact and isinstance(key, str) and is_bare_key(key):
+            return key
 
-    def dumps(self, obj: PythonValue, is_toplevel: bool = False) -> str:
-        if isinstance(obj, list):
-            return self.make_list(obj)
+        encoded = self.encode_scalar(key)
 
-        if isinstance(obj, dict):
-            return self.make_dict(obj, is_toplevel)
+        if encoded is None:
+            return "".join(self.iterencode(key))
 
+        return encoded
+
+    def encode_scalar(self, obj: PythonValue) -> str | None:
         if isinstance(obj, bool):
-            return self.random_kw(["false", "true"][obj])
+            return self.keyword(["false", "true"][obj])
 
         if obj is None:
-            return self.random_kw("haven't")
+            return self.keyword("haven't")
 
         if (
             isinstance(obj, (float, int))
@@ -109,16 +182,74 @@ class WTFLEncoder:
         if isinstance(obj, str):
             return jd(obj, ensure_ascii=self.ensure_ascii)
 
+        return None
+
+    def resolve(self, obj: PythonValue) -> str | Container:
+        """
+        Encodes a scalar, replaces unserializable values using `default`.
+        Lists and dicts are returned as is, skipped values become empty strings
+        """
+        if isinstance(obj, (list, dict)):
+            return obj
+
+        encoded = self.encode_scalar(obj)
+
+        if encoded is not None:
+            return encoded
+
         if self.skipkeys:
             return ""
 
         if self.default:
-            return self.dumps(self.default(obj))
+            return self.resolve(self.default(obj))
 
         raise TypeError(
             "Invalid data type for serialization. Provide skipkeys=True or default handler"
         )
 
+    def iterencode(
+        self, obj: PythonValue, is_toplevel: bool = False, depth: int = 0
+    ) -> Iterator[str]:
+        """
+        Encodes an object chunk by chunk, skipped values produce no chunks.
+        `depth` is the indentation level of the line the object starts on.
+
+        Nested lists and dicts are encoded from an explicit stack
+        with indentation derived from their depth, so every chunk is produced once
+        """
+        value = self.resolve(obj)
+
+        if isinstance(value, str):
+            if value:
+                yield value
+            return
+
+        stack = [self.iter_container(value, is_toplevel, depth)]
+
+        while stack:
+            for chunk in stack[-1]:
+                if isinstance(chunk, str):
+                    yield chunk
+                else:
+                    stack.append(self.iter_container(chunk[0], False, chunk[1]))
+                    break
+            else:
+                stack.pop()
+
+    def iter_container(
+        self, obj: Container, is_toplevel: bool, depth: int
+    ) -> Iterator[Chunk]:
+        if isinstance(obj, list):
+            return self.iter_list(obj, depth)
+        return self.iter_dict(obj, is_toplevel, depth)
+
+    def dumps(self, obj: PythonValue, is_toplevel: bool = False) -> str:
+        # StringIO keeps the text compact instead of holding every chunk as a separate string
+        buffer = io.StringIO()
+        for chunk in self.iterencode(obj, is_toplevel):
+            buffer.write(chunk)
+        return buffer.getvalue()
+
 
 restricted_floats = {
     float("inf"),
@@ -135,18 +266,20 @@ def dump(
     indent: int | str | None = 2,
     default: Callable[[object], str] | None = None,
     sort_keys: bool = False,
+    compact: bool = False,
 ) -> None:
-    file.write(
-        dumps(
-            obj,
-            skipkeys=skipkeys,
-            ensure_ascii=ensure_ascii,
-            indent=indent,
-            default=default,
-            sort_keys=sort_keys,
-        )
+    encoder = WTFLEncoder(
+        skipkeys=skipkeys,
+        ensure_ascii=ensure_ascii,
+        indent=indent,
+        default=default,
+        sort_keys=sort_keys,
+        compact=compact,
     )
 
+    for chunk in encoder.iterencode(obj, True):
+        file.write(chunk)
+
 
 def dumps(
     obj: PythonValue,
@@ -156,6 +289,7 @@ def dumps(
     indent: int | str | None = 2,
     default: Callable[[object], str] | None = None,
     sort_keys: bool = False,
+    compact: bool = False,
 ) -> str:
     return WTFLEncoder(
         skipkeys=skipkeys,
@@ -163,4 +297,5 @@ def dumps(
         indent=indent,
         default=default,
         sort_keys=sort_keys,
+        compact=compact,
     ).dumps(obj, True)